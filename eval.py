@@ -93,6 +93,29 @@ Examples:
         default=None,
         help="custom prompt config path",
     )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="Cache model responses (and tokenized prompts for local models) on disk (./.infer_cache) and reuse them across runs",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Dispatch API requests concurrently with asyncio (OpenAI async client, or aiohttp without openai), at most this many in flight",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="Maximum number of generated tokens for local vLLM models (default 800); lower values raise throughput when answers are short",
+    )
+    parser.add_argument(
+        "--doc-pool-backend",
+        choices=["memory", "sqlite"],
+        default="memory",
+        help="Load the document pool into memory, or convert it once to data/documents_pool.sqlite and read documents on demand",
+    )
     # Additional options
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
 
@@ -6,6 +6,9 @@ Example usage of the RAGQA evaluation system.
 from src.data import EvalResult
 from src.report import Runner
 
+# Dataset names matched against result file paths, in priority order
+DATASETS = ("hotpotqa", "popqa", "musiqueqa", "triviaqa", "2wiki", "nq", "pubmedqa")
+
 
 def create_sample_results():
     """Create sample evaluation results for testing."""
@@ -86,20 +89,9 @@ def create_results_from_jsonl(save_dir):
     jsonl_files = glob.glob(os.path.join(save_dir, "*.jsonl"))
     res = {}
     for jsonl_file in jsonl_files:
-        if "hotpotqa" in jsonl_file:
-            res["hotpotqa"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "popqa" in jsonl_file:
-            res["popqa"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "musiqueqa" in jsonl_file:
-            res["musiqueqa"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "triviaqa" in jsonl_file:
-            res["triviaqa"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "2wiki" in jsonl_file:
-            res["2wiki"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "nq" in jsonl_file:
-            res["nq"] = EvalBase.load_from_jsonl(jsonl_file).results
-        elif "pubmedqa" in jsonl_file:
-            res["pubmedqa"] = EvalBase.load_from_jsonl(jsonl_file).results
+        name = next((d for d in DATASETS if d in jsonl_file), None)
+        if name:
+            res[name] = EvalBase.load_from_jsonl(jsonl_file).results
     return res
 
 
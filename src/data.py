@@ -1,8 +1,20 @@
+import functools
+import importlib
 import json
+import os
 import random
+import sqlite3
+import string
+import tempfile
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import asdict, dataclass
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from dataclasses import fields as dataclass_fields
+from operator import attrgetter, itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
 
 try:
     from src.logger import get_logger
@@ -11,10 +23,251 @@ except ImportError:
 
 logger = get_logger()
 
-__all__ = ["EvalData", "EvalResult"]
+# The fastest installed JSON library is picked once at import; every backend
+# reads bytes and the writers below emit UTF-8 bytes
+for _backend_name in ("orjson", "ujson", "rapidjson"):
+    try:
+        _json_backend = importlib.import_module(_backend_name)
+        break
+    except ImportError:
+        continue
+else:
+    _json_backend = json
 
+JSON_BACKEND = _json_backend.__name__
+ORJSON_AVAILABLE = JSON_BACKEND == "orjson"
 
-@dataclass
+_json_loads = _json_backend.loads
+# Error raised by _json_loads on malformed input
+JSONDecodeError = getattr(_json_backend, "JSONDecodeError", json.JSONDecodeError)
+
+if ORJSON_AVAILABLE:
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        """Serialize one JSONL record, newline included, as UTF-8 bytes."""
+        return _json_backend.dumps(obj, option=_json_backend.OPT_APPEND_NEWLINE)
+
+    def _json_dumps_indented(obj: Any) -> bytes:
+        """Serialize a JSON document with 2-space indentation as UTF-8 bytes.
+
+        Non-string keys (e.g. integer result ids) are written as strings,
+        as ``json.dump`` does.
+        """
+        return _json_backend.dumps(
+            obj, option=_json_backend.OPT_INDENT_2 | _json_backend.OPT_NON_STR_KEYS
+        )
+
+else:
+    # ujson escapes "/" by default, which the other backends do not
+    _dumps_kwargs = (
+        {"escape_forward_slashes": False} if JSON_BACKEND == "ujson" else {}
+    )
+    _json_dumps = _json_backend.dumps
+
+    def _json_dumps_line(obj: Any) -> bytes:
+        """Serialize one JSONL record, newline included, as UTF-8 bytes."""
+        return (_json_dumps(obj, ensure_ascii=False, **_dumps_kwargs) + "\n").encode(
+            "utf-8"
+        )
+
+    def _json_dumps_indented(obj: Any) -> bytes:
+        """Serialize a JSON document with 2-space indentation as UTF-8 bytes."""
+        try:
+            text = _json_dumps(obj, indent=2, ensure_ascii=False, **_dumps_kwargs)
+        except TypeError:
+            # e.g. non-string keys, which rapidjson rejects
+            text = json.dumps(obj, indent=2, ensure_ascii=False)
+        return text.encode("utf-8")
+
+
+def _iter_jsonl_lines(file_path: str, chunk_size: int = 1 << 20) -> Iterator[bytes]:
+    """Yield the raw lines of a file, read in large binary chunks.
+
+    Chunks are read into one reused buffer and the partial last line is
+    moved to its front, so no per-chunk bytes objects are allocated.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        # Small files need no more than their own size (+1 to see EOF)
+        size = min(chunk_size, os.fstat(f.fileno()).st_size + 1)
+        buf = bytearray(size)
+        view = memoryview(buf)
+        find = buf.find
+        filled = 0
+        while True:
+            if filled == len(buf):
+                # A line longer than the buffer: double it
+                view.release()
+                buf.extend(bytes(len(buf)))
+                view = memoryview(buf)
+            n = f.readinto(view[filled:])
+            if not n:
+                break
+            end = filled + n
+            start = 0
+            nl = find(b"\n", filled, end)
+            while nl != -1:
+                yield bytes(view[start:nl])
+                start = nl + 1
+                nl = find(b"\n", start, end)
+            filled = end - start
+            if start:
+                view[:filled] = view[start:end]
+        if filled:
+            yield bytes(view[:filled])
+
+
+DOC_POOL_PATH = "data/documents_pool.json"
+
+# Records serialized per write() in EvalData.to_jsonl
+_JSONL_WRITE_CHUNK = 1000
+
+
+# Serializes JSON -> SQLite conversion between threads of this process
+_SQLITE_BUILD_LOCK = threading.Lock()
+
+
+class SqliteDocPool(Mapping):
+    """Read-only document pool stored in SQLite and paged in on demand.
+
+    The JSON pool is converted to a ``.sqlite`` file next to it on first use
+    (and again whenever the JSON is newer), so large corpora do not have to
+    be held in memory. Recently used documents are kept in an LRU cache.
+    """
+
+    def __init__(self, json_path: str, cache_size: int = 100_000):
+        self.json_path = json_path
+        self.db_path = str(Path(json_path).with_suffix(".sqlite"))
+        if self._is_stale():
+            with _SQLITE_BUILD_LOCK:
+                # Another thread may have converted the pool while this one waited
+                if self._is_stale():
+                    self._build()
+        # One read-only connection per thread; prompts are built in threads
+        self._local = threading.local()
+        self._get = functools.lru_cache(maxsize=cache_size)(self._fetch)
+
+    def _is_stale(self) -> bool:
+        return not os.path.exists(self.db_path) or os.path.getmtime(
+            self.db_path
+        ) < os.path.getmtime(self.json_path)
+
+    def _build(self):
+        logger.info(f"Converting {self.json_path} to {self.db_path}")
+        doc_pool = _json_loads(Path(self.json_path).read_bytes())
+        # A unique temp file in the same directory keeps concurrent builders
+        # (e.g. other processes) apart and lets os.replace swap it in atomically
+        fd, tmp_path = tempfile.mkstemp(
+            suffix=".sqlite.tmp", dir=os.path.dirname(self.db_path) or "."
+        )
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(tmp_path)
+            try:
+                conn.execute("CREATE TABLE docs (doc_id TEXT PRIMARY KEY, text TEXT)")
+                conn.executemany("INSERT INTO docs VALUES (?, ?)", doc_pool.items())
+                conn.commit()
+            finally:
+                conn.close()
+            os.replace(tmp_path, self.db_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+            self._local.conn = conn
+        return conn
+
+    def _fetch(self, doc_id: str) -> str:
+        row = (
+            self._conn()
+            .execute("SELECT text FROM docs WHERE doc_id = ?", (doc_id,))
+            .fetchone()
+        )
+        if row is None:
+            raise KeyError(doc_id)
+        return row[0]
+
+    def __getitem__(self, doc_id: str) -> str:
+        return self._get(doc_id)
+
+    def __iter__(self):
+        return (row[0] for row in self._conn().execute("SELECT doc_id FROM docs"))
+
+    def __len__(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+# Loaded pools by (path, backend). Datasets are prepared in parallel threads,
+# so loads are serialized by the lock and each pool is parsed exactly once.
+_DOC_POOLS: Dict[Tuple[str, str], Mapping] = {}
+_DOC_POOL_LOCK = threading.Lock()
+
+
+def _load_doc_pool(
+    path: str = DOC_POOL_PATH, backend: Literal["memory", "sqlite"] = "memory"
+) -> Mapping:
+    """Load the document pool once per process; the pool is shared read-only."""
+    key = (path, backend)
+    pool = _DOC_POOLS.get(key)
+    if pool is None:
+        with _DOC_POOL_LOCK:
+            # Another thread may have finished the load while this one waited
+            pool = _DOC_POOLS.get(key)
+            if pool is None:
+                if backend == "sqlite":
+                    pool = SqliteDocPool(path)
+                else:
+                    pool = _json_loads(Path(path).read_bytes())
+                _DOC_POOLS[key] = pool
+    return pool
+
+
+@functools.lru_cache(maxsize=32)
+def _load_prompt_config(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a prompt config once per file version (keyed on its mtime)."""
+    return _json_loads(Path(path).read_bytes())
+
+
+def _split_user_prompt(template: str) -> Optional[Tuple[str, str, str, bool]]:
+    """Pre-split a user prompt made of exactly one ``{docs}`` and one ``{query}``.
+
+    Returns ``(before, between, after, docs_first)`` with the literal text
+    already unescaped, or None when the template needs ``str.format``.
+    """
+    try:
+        parsed = list(string.Formatter().parse(template))
+    except ValueError:
+        return None
+    # Escaped braces split the literal text into several chunks, so literal
+    # text is accumulated until the next field
+    literals = [""]
+    fields = []
+    for literal, field, spec, conversion in parsed:
+        literals[-1] += literal
+        if field is not None:
+            if spec or conversion:
+                return None
+            fields.append(field)
+            literals.append("")
+    if sorted(fields) != ["docs", "query"]:
+        return None
+    return literals[0], literals[1], literals[2], fields[0] == "docs"
+
+
+@functools.lru_cache(maxsize=None)
+def _doc_open_tags(n: int) -> Tuple[str, ...]:
+    """Return the opening tags ``<doc_1>`` .. ``<doc_n>``."""
+    return tuple(f"<doc_{i + 1}>" for i in range(n))
+
+
+__all__ = ["EvalData", "EvalResult", "ResultsBatch", "SqliteDocPool"]
+
+
+@dataclass(slots=True)
 class EvalResult:
     """Single evaluation result."""
 
@@ -29,7 +282,7 @@ class EvalResult:
         self,
         st: Literal["id", "query", "prompt", "answer", "prediction", "label"],
     ):
-        return asdict(self).get(st)
+        return getattr(self, st, None)
 
     @classmethod
     def from_dict(cls, data: Dict) -> "EvalResult":
@@ -47,16 +300,23 @@ class EvalResult:
         self.label = label
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class EvalData:
     """Unified data evaluation data structure"""
 
     id: str
     query: str
-    golden_doc: List[str]
-    reference: List[str]
+    golden_doc: Tuple[str, ...]
+    reference: Tuple[str, ...]
     ground_truth: str
 
+    def __post_init__(self):
+        # Document lists are stored as tuples so records are hashable
+        if type(self.golden_doc) is not tuple:
+            object.__setattr__(self, "golden_doc", tuple(self.golden_doc))
+        if type(self.reference) is not tuple:
+            object.__setattr__(self, "reference", tuple(self.reference))
+
     def __call__(
         self,
         st: Literal[
@@ -67,17 +327,20 @@ class EvalData:
             "ground_truth",
         ],
     ):
-        return asdict(self).get(st)
+        return getattr(self, st, None)
 
     @classmethod
-    def from_dict(cls, data: Dict) -> "EvalData":
-        return cls(
-            id=data["id"],
-            query=data["query"],
-            golden_doc=data["golden_doc"],
-            reference=data["reference"],
-            ground_truth=data["ground_truth"],
-        )
+    def from_dict(
+        cls, data: Dict, doc_lists: Optional[Dict[tuple, tuple]] = None
+    ) -> "EvalData":
+        """Build a record from a dict; ``doc_lists`` shares equal doc tuples."""
+        id_, query, golden_doc, reference, ground_truth = _eval_data_values(data)
+        golden_doc = tuple(golden_doc)
+        reference = tuple(reference)
+        if doc_lists is not None:
+            golden_doc = doc_lists.setdefault(golden_doc, golden_doc)
+            reference = doc_lists.setdefault(reference, reference)
+        return cls(id_, query, golden_doc, reference, ground_truth)
 
     @classmethod
     def to_jsonl(cls, data_list: List["EvalData"], file_path: str) -> None:
@@ -87,10 +350,27 @@ class EvalData:
             data_list: EvalData object list
             file_path: JSONL file path to save
         """
-        with open(file_path, "w", encoding="utf-8") as f:
-            for data in data_list:
-                json_line = json.dumps(asdict(data), ensure_ascii=False)
-                f.write(json_line + "\n")
+        # Records become shallow dicts of their fields; asdict would
+        # deep-copy every document list just to serialize it
+        fields = _EVAL_DATA_FIELDS
+        get_row = attrgetter(*fields)
+
+        with open(file_path, "wb") as f, ThreadPoolExecutor(max_workers=1) as writer:
+            # One write per chunk keeps syscalls low without holding the
+            # whole serialized corpus in memory. Writes release the GIL, so
+            # a writer thread flushes one chunk while the next is serialized.
+            pending = None
+            for start in range(0, len(data_list), _JSONL_WRITE_CHUNK):
+                chunk = data_list[start : start + _JSONL_WRITE_CHUNK]
+                payload = b"".join(
+                    _json_dumps_line(dict(zip(fields, get_row(data))))
+                    for data in chunk
+                )
+                if pending is not None:
+                    pending.result()
+                pending = writer.submit(f.write, payload)
+            if pending is not None:
+                pending.result()
         logger.info(
             f"Successfully \033[35mwrite {len(data_list)} benchmark items\033[0m to \033[32m{file_path}\033[0m"
         )
@@ -98,37 +378,105 @@ class EvalData:
     @classmethod
     def from_jsonl(cls, file_path: str) -> List["EvalData"]:
         """Read data from JSONL file and convert to EvalData object list"""
-        data_list = []
-        with open(file_path, "r", encoding="utf-8") as f:
-            for line_num, line in enumerate(f, 1):
-                if line.strip():  # Skip empty lines
-                    try:
-                        data_dict = json.loads(line)
-                        data_list.append(cls.from_dict(data_dict))
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Error parsing JSON at line {line_num}: {e}")
-                        logger.error(f"Line content: {line.strip()}")
-                    except Exception as e:
-                        logger.error(
-                            f"Error processing line {line_num}: {type(e)}:{str(e)}"
-                        )
-                        logger.error(f"Line content: {line.strip()}")
+        from_dict = cls.from_dict
+        # Records repeating a golden_doc or reference list share one tuple
+        doc_lists = {}
+        try:
+            # Fast path: well-formed files never pay for per-line error handling
+            data_list = [
+                from_dict(_json_loads(line), doc_lists)
+                for line in _iter_jsonl_lines(file_path)
+                if line.strip()
+            ]
+        except Exception:
+            data_list = cls._from_lines_checked(_iter_jsonl_lines(file_path))
         logger.info(
             f"Successfully \033[34mloaded {len(data_list)} benchmark items\033[0m from \033[31m{file_path}\033[0m"
         )
         return data_list
 
+    @classmethod
+    def _from_lines_checked(cls, lines: Iterable[bytes]) -> List["EvalData"]:
+        """Slow path of from_jsonl: parse line by line, logging bad lines"""
+        data_list = []
+        doc_lists = {}
+        for line_num, line in enumerate(lines, 1):
+            if line.strip():  # Skip empty lines
+                try:
+                    data_dict = _json_loads(line)
+                    data_list.append(cls.from_dict(data_dict, doc_lists))
+                except JSONDecodeError as e:
+                    logger.error(f"Error parsing JSON at line {line_num}: {e}")
+                    logger.error(
+                        f"Line content: {line.strip().decode(errors='replace')}"
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"Error processing line {line_num}: {type(e)}:{str(e)}"
+                    )
+                    logger.error(
+                        f"Line content: {line.strip().decode(errors='replace')}"
+                    )
+        return data_list
+
     def get_answer(self) -> str:
         """Get answer"""
         return self.ground_truth
 
 
+_EVAL_DATA_FIELDS = tuple(field.name for field in dataclass_fields(EvalData))
+# Reads every field of a record dict in one call, in constructor order
+_eval_data_values = itemgetter(*_EVAL_DATA_FIELDS)
+
+
+@dataclass(slots=True)
+class ResultsBatch:
+    """Column-wise batch of evaluation results for one dataset."""
+
+    ids: List[str]
+    queries: List[str]
+    prompts: List[Any]
+    answers: List[Any]
+    predictions: List[str]
+    labels: Optional[List[Optional[bool]]] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def to_results(self) -> List[EvalResult]:
+        """Materialize the batch as EvalResult objects."""
+        labels = self.labels if self.labels is not None else [None] * len(self.ids)
+        return [
+            EvalResult(
+                id=id_,
+                query=query,
+                prompt=prompt,
+                answer=answer,
+                prediction=prediction,
+                label=label,
+            )
+            for id_, query, prompt, answer, prediction, label in zip(
+                self.ids,
+                self.queries,
+                self.prompts,
+                self.answers,
+                self.predictions,
+                labels,
+            )
+        ]
+
+
 class DataPreprocessBase(ABC):
     """Data preprocessing base class"""
 
-    def __init__(self, prompt_config_path: str = "config/default_prompt_config.json"):
+    def __init__(
+        self,
+        prompt_config_path: str = "config/default_prompt_config.json",
+        doc_pool_backend: Literal["memory", "sqlite"] = "memory",
+    ):
         self.set_prompt_config(prompt_config_path)
         self.name = self._get_name()
+        self.doc_pool_backend = doc_pool_backend
         self.doc_pool = self.get_document_pool()
 
     @abstractmethod
@@ -151,19 +499,52 @@ class DataPreprocessBase(ABC):
         """Abstract method to generate prompt, subclasses must implement"""
         pass
 
-    def get_document_pool(self) -> Dict[str, str]:
-        with open("data/documents_pool.json", "r") as f:
-            doc_pool = json.load(f)
-        return doc_pool
+    def generate_prompts_batch(
+        self, queries: List[str], docs_batch: List[List[str]]
+    ) -> List[List[Dict[str, str]]]:
+        """Generate the prompt for each (query, docs_id) pair, in order."""
+        generate_prompt = self.generate_prompt
+        return [
+            generate_prompt(query, docs_id)
+            for query, docs_id in zip(queries, docs_batch)
+        ]
+
+    def format_docs(self, docs_id: List[str]) -> str:
+        """Join the referenced documents as ``<doc_i>...</doc>`` blocks."""
+        doc_pool = self.doc_pool
+        return "\n".join(
+            [
+                tag + doc_pool[_id] + "</doc>"
+                for tag, _id in zip(_doc_open_tags(len(docs_id)), docs_id)
+            ]
+        )
+
+    def get_document_pool(self) -> Mapping:
+        return _load_doc_pool(backend=self.doc_pool_backend)
 
     def set_prompt_config(self, prompt_config_path: str):
-        with open(prompt_config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            self.prompt_config = config
-            # Initialize random number generators with seed from config
-            random_seed = config.get("random_seed", 42)
-            self.selection_rng = random.Random(random_seed)
-            self.shuffle_rng = random.Random(random_seed)
+        # Each preprocessor gets its own copy of the shared parsed config
+        config = dict(
+            _load_prompt_config(
+                prompt_config_path, os.stat(prompt_config_path).st_mtime_ns
+            )
+        )
+        self.prompt_config = config
+        # Initialize random number generators with seed from config
+        random_seed = config.get("random_seed", 42)
+        self.selection_rng = random.Random(random_seed)
+        self.shuffle_rng = random.Random(random_seed)
+        self._user_parts = _split_user_prompt(config["user_prompt"])
+
+    def format_user_prompt(self, docs_text: str, query: str) -> str:
+        """Fill the ``{docs}``/``{query}`` placeholders of the user prompt."""
+        parts = self._user_parts
+        if parts is None:
+            return self.prompt_config["user_prompt"].format(docs=docs_text, query=query)
+        a, b, c, docs_first = parts
+        if docs_first:
+            return a + docs_text + b + query + c
+        return a + query + b + docs_text + c
 
     def generate_input(
         self, shuffle: bool = True, total_doc_number: int = 10
@@ -184,36 +565,53 @@ class DataPreprocessBase(ABC):
             answers: list of answers
         """
         queries_final = []
-        prompts_final = []
+        docs_final = []
         answers_final = []
         idxs_final = []
 
-        for sample in self.data:
-            idx = sample.id
-            query = sample.query
+        # Bind hot attributes once; the RNG call order is unchanged so the
+        # sampled and shuffled documents stay identical to earlier runs.
+        shuffle_docs = self.shuffle_rng.shuffle
+        noise_docs_batch = self.generate_noise_docs_batch(self.data, total_doc_number)
 
-            answers = sample.get_answer()
-            golden_docs_ready = sample.golden_doc
-            noise_docs_ready = self.generate_noise_docs(
-                sample, total_doc_number - len(golden_docs_ready)
-            )
-            docs_ready = golden_docs_ready + noise_docs_ready
+        for sample, noise_docs in zip(self.data, noise_docs_batch):
+            docs_ready = [*sample.golden_doc, *noise_docs]
             if shuffle:
-                self.shuffle_rng.shuffle(docs_ready)
-            prompt = self.generate_prompt(query, docs_ready)
-            prompts_final.append(prompt)
-            answers_final.append(answers)
-            queries_final.append(query)
-            idxs_final.append(idx)
+                shuffle_docs(docs_ready)
+            docs_final.append(docs_ready)
+            answers_final.append(sample.get_answer())
+            queries_final.append(sample.query)
+            idxs_final.append(sample.id)
 
+        prompts_final = self.generate_prompts_batch(queries_final, docs_final)
         return idxs_final, queries_final, prompts_final, answers_final
 
     def generate_noise_docs(self, sample: EvalData, noise_doc_number: int) -> List[str]:
         """
         Generate noise docs for the sample.
         """
-        if noise_doc_number > len(sample.reference):
-            logger.info(f"Sample {sample.id} has insufficient reference length: {len(sample.reference)}")
-        return self.selection_rng.sample(
-            sample.reference, min(noise_doc_number, len(sample.reference))
-        )
+        total_doc_number = noise_doc_number + len(sample.golden_doc)
+        return self.generate_noise_docs_batch([sample], total_doc_number)[0]
+
+    def generate_noise_docs_batch(
+        self, samples: List[EvalData], total_doc_number: int
+    ) -> List[List[str]]:
+        """
+        Generate noise docs for every sample in one pass.
+
+        Selection and shuffling use separate RNGs, so drawing all selections
+        up front in sample order gives the same docs as per-sample calls.
+        """
+        rng_sample = self.selection_rng.sample
+        noise_docs_batch = []
+        for sample in samples:
+            reference = sample.reference
+            noise_doc_number = total_doc_number - len(sample.golden_doc)
+            if noise_doc_number > len(reference):
+                logger.info(
+                    f"Sample {sample.id} has insufficient reference length: {len(reference)}"
+                )
+            noise_docs_batch.append(
+                rng_sample(reference, min(noise_doc_number, len(reference)))
+            )
+        return noise_docs_batch
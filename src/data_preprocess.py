@@ -1,4 +1,5 @@
 import json
+from functools import partial
 from typing import Dict, List
 
 from .data import DataPreprocessBase, EvalData
@@ -8,31 +9,35 @@ from .report import NAME_TO_EVAL_CLASS
 class DataPreprocess(DataPreprocessBase):
     """General data preprocessor"""
 
-    def __init__(self, prompt_config_path: str, data_path: str):
-        super().__init__(prompt_config_path=prompt_config_path)
+    def __init__(
+        self,
+        prompt_config_path: str,
+        data_path: str,
+        name: str = "general",
+        doc_pool_backend: str = "memory",
+    ):
+        self._name = name
+        super().__init__(
+            prompt_config_path=prompt_config_path, doc_pool_backend=doc_pool_backend
+        )
         self.data = self.load_data(data_path=data_path)
 
     def _get_name(self) -> str:
-        """Get the name of the general preprocessor"""
-        return "general"
+        """Get the name of the preprocessor"""
+        return self._name
 
     def load_data(self, data_path: str) -> List[EvalData]:
         """Load general data"""
         return EvalData.from_jsonl(data_path)
 
     def get_corresponding_eval_type(self):
-        pass
+        """Get corresponding eval type for the dataset, None for general data"""
+        return NAME_TO_EVAL_CLASS.get(self.name)
 
     def generate_prompt(self, query: str, docs_id: List[str]) -> List[Dict[str, str]]:
         """Format the prompt for the model."""
         # get document str from doc_id
-        docs = []
-        for _id in docs_id:
-            docs.append(self.doc_pool[_id])
-
-        docs_text = "\n".join(
-            [f"<doc_{i+1}>" + doc + "</doc>" for i, doc in enumerate(docs)]
-        )
+        docs_text = self.format_docs(docs_id)
 
         return [
             {
@@ -41,19 +46,36 @@ class DataPreprocess(DataPreprocessBase):
             },
             {
                 "role": "user",
-                "content": self.prompt_config["user_prompt"].format(
-                    docs=docs_text, query=query
-                ),
+                "content": self.format_user_prompt(docs_text, query),
             },
         ]
 
+    def generate_prompts_batch(
+        self, queries: List[str], docs_batch: List[List[str]]
+    ) -> List[List[Dict[str, str]]]:
+        """Generate prompts for many queries, sharing the system message setup."""
+        system_prompt = self.prompt_config["system_prompt"]
+        format_docs = self.format_docs
+        format_user_prompt = self.format_user_prompt
+        return [
+            [
+                {"role": "system", "content": system_prompt},
+                {
+                    "role": "user",
+                    "content": format_user_prompt(format_docs(docs_id), query),
+                },
+            ]
+            for query, docs_id in zip(queries, docs_batch)
+        ]
+
 
 class PubmedQAPreprocess(DataPreprocessBase):
     """PubmedQA specialized preprocessor"""
 
-    def __init__(self):
+    def __init__(self, doc_pool_backend: str = "memory"):
         super().__init__(
             prompt_config_path="config/api_prompt_config_en.json",
+            doc_pool_backend=doc_pool_backend,
         )
         self.data = self.load_data(data_path="data/pubmed.jsonl")
 
@@ -72,12 +94,7 @@ class PubmedQAPreprocess(DataPreprocessBase):
     def generate_prompt(self, query: str, docs_id: List[str]) -> List[Dict[str, str]]:
         """Format the prompt for the model."""
         # get document str from doc_id
-        docs = []
-        for _id in docs_id:
-            docs.append(self.doc_pool[_id])
-        docs_text = "\n".join(
-            [f"<doc_{i+1}>" + doc + "</doc>" for i, doc in enumerate(docs)]
-        )
+        docs_text = self.format_docs(docs_id)
         return [
             {
                 "role": "system",
@@ -85,101 +102,37 @@ class PubmedQAPreprocess(DataPreprocessBase):
             },
             {
                 "role": "user",
-                "content": self.prompt_config["user_prompt"].format(
-                    docs=docs_text, query=query
-                ) + ", only response in one of 'yes', 'no' and 'maybe'",
+                "content": self.format_user_prompt(docs_text, query)
+                + ", only response in one of 'yes', 'no' and 'maybe'",
             },
         ]
 
 
-class HotpotQAPreprocess(DataPreprocess):
-    """HotpotQA specialized preprocessor"""
-
-    def __init__(self):
-        super().__init__(
-            prompt_config_path="config/api_prompt_config_en.json",
-            data_path="data/hotpot_distractor.jsonl",
-        )
-
-    def _get_name(self) -> str:
-        """Get the name of the HotpotQA preprocessor"""
-        return "hotpotqa"
-
-    def get_corresponding_eval_type(self):
-        """Get corresponding eval type for HotpotQA"""
-        return NAME_TO_EVAL_CLASS["hotpotqa"]
-
-
-class PopQAPreprocess(DataPreprocess):
-    """PopQA specialized preprocessor"""
-
-    def __init__(self):
-        super().__init__(
-            prompt_config_path="config/api_prompt_config_en.json",
-            data_path="data/popqa.jsonl",
-        )
-
-    def _get_name(self) -> str:
-        """Get the name of the PopQA preprocessor"""
-        return "popqa"
-
-    def get_corresponding_eval_type(self):
-        """Get corresponding eval type for PopQA"""
-        return NAME_TO_EVAL_CLASS["popqa"]
-
-
-class MusiqueQAPreprocess(DataPreprocess):
-    """MusiqueQA specialized preprocessor"""
-
-    def __init__(self):
-        super().__init__(
-            prompt_config_path="config/api_prompt_config_en.json",
-            data_path="data/musique.jsonl",
-        )
-
-    def _get_name(self) -> str:
-        """Get the name of the MusiqueQA preprocessor"""
-        return "musiqueqa"
-
-    def get_corresponding_eval_type(self):
-        """Get corresponding eval type for MusiqueQA"""
-        return NAME_TO_EVAL_CLASS["musiqueqa"]
-
-
-class TwoWIKIPreprocess(DataPreprocess):
-    def __init__(self):
-        super().__init__(
-            prompt_config_path="config/api_prompt_config_en.json",
-            data_path="data/2wiki.jsonl",
-        )
-
-    def _get_name(self) -> str:
-        return "2wiki"
-
-    def get_corresponding_eval_type(self):
-        return NAME_TO_EVAL_CLASS["2wiki"]
-
-
-class TriviaQAPreprocess(DataPreprocess):
-    def __init__(self):
-        super().__init__(
-            prompt_config_path="config/api_prompt_config_en.json",
-            data_path="data/triviaqa.jsonl",
-        )
-
-    def _get_name(self) -> str:
-        return "triviaqa"
+# Datasets that only differ by name and data file
+DATASET_PATHS = {
+    "hotpotqa": "data/hotpot_distractor.jsonl",
+    "popqa": "data/popqa.jsonl",
+    "musiqueqa": "data/musique.jsonl",
+    "2wiki": "data/2wiki.jsonl",
+    "triviaqa": "data/triviaqa.jsonl",
+}
 
-    def get_corresponding_eval_type(self):
-        return NAME_TO_EVAL_CLASS["triviaqa"]
 
+def _dataset_preprocess(name: str):
+    """Build the preprocessor factory for a dataset in DATASET_PATHS."""
+    return partial(
+        DataPreprocess,
+        prompt_config_path="config/api_prompt_config_en.json",
+        data_path=DATASET_PATHS[name],
+        name=name,
+    )
 
 
 NAME_TO_CLASS = {
-    "hotpotqa": HotpotQAPreprocess,
-    "popqa": PopQAPreprocess,
-    "musiqueqa": MusiqueQAPreprocess,
+    "hotpotqa": _dataset_preprocess("hotpotqa"),
+    "popqa": _dataset_preprocess("popqa"),
+    "musiqueqa": _dataset_preprocess("musiqueqa"),
     "pubmedqa": PubmedQAPreprocess,
-    "2wiki": TwoWIKIPreprocess,
-    "triviaqa": TriviaQAPreprocess,
+    "2wiki": _dataset_preprocess("2wiki"),
+    "triviaqa": _dataset_preprocess("triviaqa"),
 }
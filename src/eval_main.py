@@ -1,31 +1,126 @@
 import argparse
 import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 
-from .data import EvalResult
+from .data import ResultsBatch
 from .data_preprocess import NAME_TO_CLASS
+from .inference_cache import InferenceCache
 from .logger import get_logger
+from .tokenize_cache import TokenizeCache
 
 logger = get_logger()
 SUPPORTED_DATASET = list(NAME_TO_CLASS.keys())
 
 
+def cache_model_key(model_name, model_path, gen_kwargs) -> List[str]:
+    """Model identity used in inference cache keys."""
+    model_key = [model_name, model_path]
+    if "max_tokens" in gen_kwargs:
+        # Cached responses were generated under a different decode budget
+        model_key.append(f"max_tokens={gen_kwargs['max_tokens']}")
+    return model_key
+
+
+def cached_batch_generate(
+    model,
+    cache: InferenceCache,
+    model_key,
+    prompts,
+    temperature,
+    batch_size,
+    **gen_kwargs,
+):
+    """Run `model.batch_generate` only on prompts missing from the cache."""
+    keys = [InferenceCache.make_key(model_key, temperature, p) for p in prompts]
+    hits = cache.get_many(keys)
+    miss_idx = [i for i, k in enumerate(keys) if k not in hits]
+    logger.info(
+        f"Inference cache: {len(prompts) - len(miss_idx)} hits, {len(miss_idx)} misses"
+    )
+
+    predictions = [hits.get(k) for k in keys]
+    if miss_idx:
+        miss_preds = model.batch_generate(
+            [prompts[i] for i in miss_idx],
+            temperature,
+            batch_size=batch_size,
+            **gen_kwargs,
+        )
+        for i, pred in zip(miss_idx, miss_preds):
+            predictions[i] = pred
+        cache.set_many({keys[i]: pred for i, pred in zip(miss_idx, miss_preds)})
+    return predictions
+
+
+def prepare_dataset(
+    eval_dataset_name, shuffle, total_doc_number, doc_pool_backend="memory"
+):
+    """Load a dataset and build its prompts; safe to run in a worker thread."""
+    ragdata = NAME_TO_CLASS[eval_dataset_name](doc_pool_backend=doc_pool_backend)
+    idxs, queries, prompts, answers = ragdata.generate_input(
+        shuffle=shuffle, total_doc_number=total_doc_number
+    )
+    return ragdata, idxs, queries, prompts, answers
+
+
 def get_eval(args):
+    shuffle = args.shuffle
+    total_doc_number = args.total_doc_number
+    # breakpoint()
+    # 采样
+    # ragdata.data = ragdata.data[:1]
+
+    # Prompts are built in background threads so dataset loading overlaps with
+    # model loading and with inference on the previous dataset. Each
+    # preprocessor owns its RNGs, so the prompts are identical to a serial run.
+    # The shared document pool is loaded under a lock by the first thread to
+    # need it; the others wait for that load instead of parsing it again.
+    executor = ThreadPoolExecutor(max_workers=len(args.eval_dataset))
+    doc_pool_backend = getattr(args, "doc_pool_backend", None) or "memory"
+    futures = [
+        executor.submit(
+            prepare_dataset, name, shuffle, total_doc_number, doc_pool_backend
+        )
+        for name in args.eval_dataset
+    ]
+    try:
+        return _run_eval(args, futures)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _run_eval(args, futures):
     model_name = args.model_name
     model_path = args.model_path
     output_path = args.output_path
 
-    shuffle = args.shuffle
     batch_size = args.batch_size
     temperature = args.temperature
     total_doc_number = args.total_doc_number
-    # breakpoint()
-    # 采样
-    # ragdata.data = ragdata.data[:1]
+    tokenize_cache = None
+    # Identical prompts share one generation only when decoding is greedy;
+    # with sampling each duplicate must be drawn independently
+    deduplicate = temperature <= 0
+    # Extra batch_generate arguments; only the local vLLM backends take them
+    gen_kwargs = {}
     if "http" in model_path:
         import importlib.util
 
-        if importlib.util.find_spec("openai") is None:
+        has_openai = importlib.util.find_spec("openai") is not None
+        max_concurrency = getattr(args, "max_concurrency", None)
+        if max_concurrency and not has_openai:
+            from .models import AsyncAPIModel
+
+            model = AsyncAPIModel(
+                url=model_path,
+                model=model_name,
+                api_key=args.api_key,
+                inference_mode=args.inference_mode,
+                deduplicate=deduplicate,
+                max_concurrency=max_concurrency,
+            )
+        elif not has_openai:
             from .models import APIModel
 
             model = APIModel(
@@ -33,6 +128,18 @@ def get_eval(args):
                 model=model_name,
                 api_key=args.api_key,
                 inference_mode=args.inference_mode,
+                deduplicate=deduplicate,
+            )
+        elif max_concurrency:
+            from .models import OpenAIAsyncModel
+
+            model = OpenAIAsyncModel(
+                url=model_path,
+                model=model_name,
+                api_key=args.api_key,
+                inference_mode=args.inference_mode,
+                deduplicate=deduplicate,
+                max_concurrency=max_concurrency,
             )
         else:
             from .models import OpenAIModel
@@ -42,42 +149,72 @@ def get_eval(args):
                 model=model_name,
                 api_key=args.api_key,
                 inference_mode=args.inference_mode,
+                deduplicate=deduplicate,
             )
 
     else:
+        if getattr(args, "max_tokens", None):
+            gen_kwargs["max_tokens"] = args.max_tokens
+        if getattr(args, "use_cache", False):
+            tokenize_cache = TokenizeCache()
         if not args.inference_mode:
             if "qwen3" in model_name.lower():
                 from .models import Qwen3Vllm
 
-                model = Qwen3Vllm(plm=model_path, think_mode=False)
+                model = Qwen3Vllm(
+                    plm=model_path,
+                    think_mode=False,
+                    tokenize_cache=tokenize_cache,
+                    deduplicate=deduplicate,
+                )
             else:
                 from .models import CommonModelVllm
 
-                model = CommonModelVllm(plm=model_path)
+                model = CommonModelVllm(
+                    plm=model_path,
+                    tokenize_cache=tokenize_cache,
+                    deduplicate=deduplicate,
+                )
         else:
             from .models import InferModelVllm
 
-            model = InferModelVllm(plm=model_path)
+            model = InferModelVllm(
+                plm=model_path, tokenize_cache=tokenize_cache, deduplicate=deduplicate
+            )
 
-    return_result_dict = {}
-    for eval_dataset_name in args.eval_dataset:
-        ragdata = NAME_TO_CLASS[eval_dataset_name]()
+    cache = InferenceCache() if getattr(args, "use_cache", False) else None
+    model_key = cache_model_key(model_name, model_path, gen_kwargs)
 
-        idxs, queries, prompts, answers = ragdata.generate_input(
-            shuffle=shuffle, total_doc_number=total_doc_number
-        )
-        predictions = model.batch_generate(prompts, temperature, batch_size=batch_size)
+    return_result_dict = {}
+    for eval_dataset_name, future in zip(args.eval_dataset, futures):
+        ragdata, idxs, queries, prompts, answers = future.result()
+        # Identical prompts are collapsed by the backend's batch_generate
+        # (see its `deduplicate` flag), so they are passed through as-is
+        if cache is None:
+            predictions = model.batch_generate(
+                prompts, temperature, batch_size=batch_size, **gen_kwargs
+            )
+        else:
+            predictions = cached_batch_generate(
+                model,
+                cache,
+                model_key,
+                prompts,
+                temperature,
+                batch_size,
+                **gen_kwargs,
+            )
 
         rageval = ragdata.get_corresponding_eval_type()()
-        for i in range(len(idxs)):
-            result = EvalResult(
-                id=idxs[i],
-                query=queries[i],
-                prompt=prompts[i],
-                answer=answers[i],
-                prediction=predictions[i],
+        rageval.add_batch(
+            ResultsBatch(
+                ids=idxs,
+                queries=queries,
+                prompts=prompts,
+                answers=answers,
+                predictions=predictions,
             )
-            rageval.add_result(result)
+        )
 
         rageval.save_results(
             f"{output_path}/{model_name}_eval_result_{ragdata.name}_#{total_doc_number}.jsonl"
@@ -85,6 +222,11 @@ def get_eval(args):
 
         return_result_dict[eval_dataset_name] = rageval.results
 
+    if cache is not None:
+        cache.close()
+    if tokenize_cache is not None:
+        tokenize_cache.close()
+
     print(
         f"{output_path}/{model_name}_eval_result_{ragdata.name}_#{total_doc_number}.jsonl"
     )
@@ -144,6 +286,29 @@ if __name__ == "__main__":
         default=0.0,
         help="number of external passages",
     )
+    parser.add_argument(
+        "--use-cache",
+        action="store_true",
+        help="cache model responses on disk and reuse them across runs",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="dispatch api requests concurrently with asyncio, at most this many in flight",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=None,
+        help="max generated tokens for local vllm models (default 800)",
+    )
+    parser.add_argument(
+        "--doc-pool-backend",
+        choices=["memory", "sqlite"],
+        default="memory",
+        help="load the document pool into memory or page it from a sqlite copy",
+    )
     parser.add_argument("--gpu", type=int, default=8, help="number of iterations")
     args = parser.parse_args()
     get_eval(args)
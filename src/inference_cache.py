@@ -0,0 +1,73 @@
+"""
+On-disk cache for model inference results.
+
+Responses are stored in a SQLite table keyed by a hash of the model identity,
+the sampling temperature and the prompt, so repeated evaluation runs only send
+uncached prompts to the backend.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import Any, Dict, List
+
+from .logger import get_logger
+
+logger = get_logger()
+
+__all__ = ["InferenceCache", "DEFAULT_CACHE_DIR"]
+
+DEFAULT_CACHE_DIR = "./.infer_cache"
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_CHUNK = 500
+
+
+class InferenceCache:
+    """SQLite-backed cache mapping prompt keys to model responses."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, "cache.sqlite")
+        self.conn = sqlite3.connect(self.cache_path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, response TEXT)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(model_key: List[str], temperature: float, prompt: Any) -> str:
+        """Build the cache key for a single prompt."""
+        payload = json.dumps(
+            [model_key, temperature, prompt], sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, str]:
+        """Return the cached responses for the keys that are present."""
+        hits = {}
+        for i in range(0, len(keys), _SQLITE_CHUNK):
+            chunk = keys[i : i + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, response FROM cache WHERE key IN ({placeholders})",
+                chunk,
+            )
+            hits.update(rows)
+        return hits
+
+    def set_many(self, items: Dict[str, str]) -> None:
+        """Store responses, skipping failed generations so they are retried."""
+        rows = [
+            (key, response)
+            for key, response in items.items()
+            if isinstance(response, str) and not response.startswith("Error:")
+        ]
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO cache (key, response) VALUES (?, ?)", rows
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
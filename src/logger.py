@@ -30,13 +30,10 @@ def get_logger(name: Optional[str] = None) -> logging.Logger:
         _setup_global_logger()
 
     if name is None:
-        # 获取调用模块的名称
-        import inspect
-
-        frame = inspect.currentframe().f_back
-        if frame:
-            module_name = frame.f_globals.get("__name__", "unknown")
-        else:
+        # 获取调用模块的名称（sys._getframe 比 inspect 开销小）
+        try:
+            module_name = sys._getframe(1).f_globals.get("__name__", "unknown")
+        except ValueError:
             module_name = "unknown"
         return logging.getLogger(module_name)
     else:
@@ -1,46 +1,59 @@
 # Unified import file for all models
 # This file maintains backward compatibility while separating API and vLLM models
 
+import importlib
+
 from ..logger import get_logger
 
 logger = get_logger()
 
-# Import API models directly
-from .api_models import APIModel, OpenAIModel, transfer_dict_conv
-
-# Export API models for immediate access
+# Public model API; every name is resolved lazily by __getattr__ below
 __all__ = [
     "transfer_dict_conv",
+    "batch_transfer_dict_conv",
     "APIModel",
     "OpenAIModel",
+    "OpenAIAsyncModel",
+    "AsyncAPIModel",
     "CommonModelVllm",
     "InferModelVllm",
     "Qwen3Vllm",
     "HiragVllm",
 ]
 
+# Backends are imported on first access so that picking one model does not
+# pay for importing the others (openai/requests for API models, vllm/torch
+# for local models).
+_LAZY_ATTRS = {
+    "transfer_dict_conv": ".conversation",
+    "batch_transfer_dict_conv": ".conversation",
+    "APIModel": ".api_models",
+    "OpenAIModel": ".api_models",
+    "OpenAIAsyncModel": ".api_models",
+    "AsyncAPIModel": ".api_models",
+    "CommonModelVllm": ".vllm_models",
+    "InferModelVllm": ".vllm_models",
+    "Qwen3Vllm": ".vllm_models",
+    "HiragVllm": ".vllm_models",
+}
+
 
-# Lazy loading of vLLM models
 def __getattr__(name):
-    """Lazy loading for vLLM models"""
-    if name in ["CommonModelVllm", "InferModelVllm", "Qwen3Vllm", "HiragVllm"]:
-        try:
-            from .vllm_models import (
-                CommonModelVllm,
-                HiragVllm,
-                InferModelVllm,
-                Qwen3Vllm,
-            )
-
-            if name == "CommonModelVllm":
-                return CommonModelVllm
-            elif name == "InferModelVllm":
-                return InferModelVllm
-            elif name == "Qwen3Vllm":
-                return Qwen3Vllm
-            elif name == "HiragVllm":
-                return HiragVllm
-        except ImportError as e:
+    """Lazy loading for API and vLLM models"""
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    try:
+        module = importlib.import_module(module_name, __name__)
+    except ImportError as e:
+        if module_name == ".vllm_models":
             logger.warning(f"Could not import vLLM models: {e}")
             raise AttributeError(f"vLLM models not available: {e}")
-    raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+        raise
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,17 +1,20 @@
+import asyncio
 import json
 import os
 import random
 import re
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
-from queue import Queue
-from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
 
 import requests
 from tqdm import tqdm
 
 from ..logger import get_logger
+# Re-exported: callers have imported these helpers from this module
+from .conversation import batch_transfer_dict_conv, transfer_dict_conv
+from .dedup import dedup_prompts
 
 logger = get_logger()
 
@@ -26,27 +29,59 @@ except ImportError:
         "OpenAI is not installed. Please install it with: pip install openai"
     )
 
+# orjson import - optional, faster request/response (de)serialization
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# aiohttp import - optional, only needed by AsyncAPIModel
+try:
+    import aiohttp
+
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Exceptions that are always retried; requests' RequestException covers
+# connection errors, timeouts, HTTP errors and malformed JSON bodies
+_RETRY_EXCEPTIONS = (requests.exceptions.RequestException,)
+# Exceptions carrying a status code, retried on 5xx and these codes
+_STATUS_EXCEPTIONS = ()
+_RETRY_STATUS_CODES = frozenset({408, 429})
+if OPENAI_AVAILABLE:
+    _RETRY_EXCEPTIONS += (openai.APIConnectionError,)
+    _STATUS_EXCEPTIONS += (openai.APIStatusError,)
+if AIOHTTP_AVAILABLE:
+    _RETRY_EXCEPTIONS += (aiohttp.ClientError, asyncio.TimeoutError)
 
-def get_api_key():
-    """获取API密钥，支持运行时读取环境变量"""
-    return os.getenv("API_KEY")
 
+def _dumps_body(query: Dict) -> bytes:
+    """Encode a request body as UTF-8 JSON bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(query)
+    return json.dumps(query, ensure_ascii=False).encode("utf-8")
 
-def transfer_dict_conv(
-    inputs: List[str], system: Optional[str] = None
-) -> List[Dict[str, str]]:
-    assert len(inputs) % 2 == 1, "number of rounds must be odd"
-    output_chat_dict = [{"role": "system", "content": system}] if system else []
 
-    for i in range(len(inputs)):
-        if i % 2 == 0:
-            output_chat_dict.append({"role": "user", "content": inputs[i]})
-        elif i % 2 == 1:
-            output_chat_dict.append({"role": "assistant", "content": inputs[i]})
-    return output_chat_dict
+def _loads_response(content: bytes):
+    """Decode a JSON response body; malformed bodies stay retryable."""
+    try:
+        return orjson.loads(content) if ORJSON_AVAILABLE else json.loads(content)
+    except ValueError as e:
+        raise requests.exceptions.InvalidJSONError(f"Invalid JSON response: {e}") from e
+
+
+def get_api_key():
+    """获取API密钥，支持运行时读取环境变量"""
+    return os.getenv("API_KEY")
 
 
 class APIInferenceBase:
+    # Upper bound for a single backoff sleep between retries, in seconds
+    max_retry_delay = 60.0
+
     def __init__(
         self,
         url="https://api.openai.com/v1/chat/completions",
@@ -56,6 +91,7 @@ class APIInferenceBase:
         max_retries=10,
         retry_delay=1.0,
         retry_backoff=2.0,
+        deduplicate=True,
     ):
         if api_key is None:
             api_key = get_api_key()
@@ -70,48 +106,38 @@ class APIInferenceBase:
         self.max_retries = max_retries
         self.retry_delay = retry_delay
         self.retry_backoff = retry_backoff
+        # Send identical prompts once; disable to sample duplicates independently
+        self.deduplicate = deduplicate
 
     def _should_retry(self, exception, response=None):
         """
         判断是否应该重试
         """
-        if isinstance(
-            exception,
-            (
-                requests.exceptions.ConnectionError,
-                requests.exceptions.Timeout,
-                requests.exceptions.RequestException,
-                requests.exceptions.HTTPError,
-            ),
-        ):
+        if isinstance(exception, _RETRY_EXCEPTIONS):
             return True
-        # 对于 HTTPError，检查状态码
-        if isinstance(exception, requests.exceptions.HTTPError) or isinstance(
-            exception, openai.RateLimitError
-        ):
-            # 尝试从异常中提取状态码
-            try:
-                # HTTPError 通常包含状态码信息
-                if hasattr(exception, "response") and exception.response is not None:
-                    status_code = exception.response.status_code
-                    # 5xx 错误和某些 4xx 错误应该重试
-                    if status_code >= 500 or status_code in [408, 429, 502, 503, 504]:
-                        return True
-            except:
-                pass
-
+        # 带状态码的 SDK 异常：5xx 和部分 4xx 应该重试
+        if isinstance(exception, _STATUS_EXCEPTIONS):
+            status_code = exception.status_code
+            return status_code >= 500 or status_code in _RETRY_STATUS_CODES
         if response is not None:
-            if response.status_code != 200:
-                return True
-
+            return response.status_code != 200
         return False
 
+    def _next_delay(self, delay):
+        """Decorrelated jitter: next sleep drawn from [retry_delay, delay * backoff].
+
+        Randomizing over the whole range keeps clients that failed together
+        from retrying in lockstep; the upper end is capped at max_retry_delay.
+        """
+        upper = min(self.max_retry_delay, delay * self.retry_backoff)
+        return random.uniform(self.retry_delay, max(self.retry_delay, upper))
+
     def _retry_with_backoff(self, func, *args, **kwargs):
         """
         带指数退避的重试机制
         """
         last_exception = None
-        delay = self.retry_delay
+        sleep_time = self.retry_delay
 
         for attempt in range(self.max_retries + 1):
             try:
@@ -120,14 +146,13 @@ class APIInferenceBase:
                     logger.debug(f"API调用第1次尝试")
                     return func(*args, **kwargs)
                 else:
-                    # 重试前等待,增加延迟时间（指数退避）
+                    # 重试前等待（去相关抖动的指数退避，上限 max_retry_delay）
+                    sleep_time = self._next_delay(sleep_time)
                     if attempt % 5 == 0:
                         logger.info(
-                            f"API调用失败，等待 {delay:.2f}s 后进行第{attempt + 1}次重试"
+                            f"API调用失败，等待 {sleep_time:.2f}s 后进行第{attempt + 1}次重试"
                         )
-                    time.sleep(delay)
-                    delay *= self.retry_backoff
-                    delay += random.uniform(0, 0.1 * delay)
+                    time.sleep(sleep_time)
                     logger.debug(f"API调用第{attempt + 1}次尝试")
                     return func(*args, **kwargs)
 
@@ -147,6 +172,19 @@ class APIInferenceBase:
         raise last_exception
 
     def batch_generate(self, data, temperature=0.0, top_p=0.8, batch_size=5):
+        """
+        Batch generate responses, sending each distinct prompt only once
+        when `deduplicate` is enabled
+        """
+        if not self.deduplicate:
+            return self._batch_generate(data, temperature, top_p, batch_size)
+        unique, inverse = dedup_prompts(data)
+        if len(unique) < len(data):
+            logger.info(f"Deduplicated {len(data)} prompts to {len(unique)} unique")
+        results = self._batch_generate(unique, temperature, top_p, batch_size)
+        return [results[i] for i in inverse]
+
+    def _batch_generate(self, data, temperature=0.0, top_p=0.8, batch_size=5):
         """
         Batch generate responses with QPS control and threading
 
@@ -156,43 +194,28 @@ class APIInferenceBase:
             top_p: Top-p sampling parameter
             batch_size: Batch size for processing
         """
-        self.queue = Queue()
         self.stats = {
             "total": len(data),
             "success": 0,
             "fail": 0,
             "total_time": 0.0,
-            "lock": threading.Lock(),
         }
-        self.session = requests.Session()
-        self.results = {}
-        self.results_lock = threading.Lock()
-        self.pbar = tqdm(total=len(data), desc="Processing API Requests")
-        self.stop_event = threading.Event()
-
-        # 添加重试计数器
-        self.retry_counts = {}
-        self.retry_counts_lock = threading.Lock()
 
         self.qps = batch_size
         logger.info(f"Using QPS {self.qps}")
         self.tokens = batch_size  # 初始令牌数
-        self.last_refill = time.time()
-        self.token_lock = threading.Lock()
+        self.last_refill = time.monotonic()
+        self.token_cv = threading.Condition()
 
-        # 将查询请求放入队列，同时保存索引
-        for i, item in enumerate(data):
-            self.queue.put((i, item))
-
-        return self.run_batch(temperature, top_p, batch_size)
+        return self.run_batch(data, temperature, top_p, batch_size)
 
     def acquire_token(self):
         """
         使用令牌桶算法控制QPS
         """
-        while True:
-            with self.token_lock:
-                now = time.time()
+        with self.token_cv:
+            while True:
+                now = time.monotonic()
                 # 补充令牌
                 time_passed = now - self.last_refill
                 new_tokens = time_passed * self.qps
@@ -202,140 +225,102 @@ class APIInferenceBase:
                 if self.tokens >= 1:
                     self.tokens -= 1
                     return  # 获得令牌，可以执行请求
-                else:
-                    # 没有令牌，等待
-                    wait_time = (1 - self.tokens) / self.qps
-                    time.sleep(wait_time)
+                # 没有令牌，等待（wait 会释放锁，其他线程不会被阻塞在锁上）
+                self.token_cv.wait(timeout=(1 - self.tokens) / self.qps)
 
-    def worker(self, temperature, top_p):
+    def _one(self, index, messages, temperature, top_p):
         """
-        工作线程，从队列中获取请求并处理
+        处理单个请求，返回 (结果, 是否成功, 耗时)
         """
-        thread_id = threading.current_thread().ident
-        logger.debug(f"Worker线程 {thread_id} 启动")
-
-        while not self.stop_event.is_set():
-            try:
-                item = self.queue.get(timeout=1)
-                if item is None:
-                    break  # 收到结束信号则退出
-
-                index, messages = item
-                logger.debug(f"线程 {thread_id} 开始处理请求 {index}")
+        # 获取令牌以控制QPS
+        self.acquire_token()
 
-                # 获取令牌以控制QPS
-                self.acquire_token()
-
-                start_time = time.time()
-                success = False
-                try:
-                    result = self.generate(messages, temperature, top_p)
-                    with self.results_lock:
-                        self.results[index] = result
-                    success = True
-                    logger.debug(
-                        f"线程 {thread_id} 请求 {index} 成功，耗时: {time.time() - start_time:.2f}s"
-                    )
-                    should_retry = False
-                except Exception as e:
-                    # 检查是否是可重试的异常
-                    should_retry = self._should_retry(e)
-                    current_retries = 0  # 初始化重试次数
-
-                    if should_retry:
-                        # 检查重试次数
-                        with self.retry_counts_lock:
-                            current_retries = self.retry_counts.get(index, 0)
-                            if current_retries < self.max_retries:
-                                self.retry_counts[index] = current_retries + 1
-                                logger.warning(
-                                    f"线程 {thread_id} 请求 {index} 遇到可重试异常，第{current_retries + 1}次重试: {str(e)}"
-                                )
-                                # 将请求重新放回队列进行重试
-                                self.queue.put((index, messages))
-                                # 不调用 task_done()，因为任务还没有完成
-                                continue  # 继续处理下一个请求
-                            else:
-                                logger.error(
-                                    f"线程 {thread_id} 请求 {index} 重试次数已达上限({self.max_retries})，放弃重试: {str(e)}"
-                                )
-                                with self.results_lock:
-                                    self.results[index] = (
-                                        f"Error: Max retries exceeded - {str(e)}"
-                                    )
-                                success = False
-                    else:
-                        # 不可重试的异常，记录错误
-                        with self.results_lock:
-                            self.results[index] = f"Error: {str(e)}"
-                        logger.error(
-                            f"线程 {thread_id} 请求 {index} 遇到不可重试异常: {messages[-1]['content'][-20:]} - {str(e)}"
-                        )
-                        success = False
-
-                response_time = time.time() - start_time
-
-                with self.stats["lock"]:
-                    if success:
-                        self.stats["success"] += 1
-                        self.stats["total_time"] += response_time
-                        self.pbar.update(1)
-                    else:
-                        self.stats["fail"] += 1
-
-                # 只有在不重试的情况下才调用 task_done()
-                if not should_retry or (
-                    should_retry and current_retries >= self.max_retries
-                ):
-                    self.queue.task_done()
-            except Exception as e:
-                if not self.queue.empty():
-                    logger.error(f"Worker线程 {thread_id} 异常: {str(e)}")
-                break
-
-        logger.debug(f"Worker线程 {thread_id} 退出")
+        start_time = time.time()
+        # generate() retries with exponential backoff itself, so a failure
+        # here is final for this request
+        try:
+            result = self.generate(messages, temperature, top_p)
+            success = True
+            logger.debug(f"请求 {index} 成功，耗时: {time.time() - start_time:.2f}s")
+        except Exception as e:
+            result = f"Error: {str(e)}"
+            success = False
+            logger.error(
+                f"请求 {index} 失败: {messages[-1]['content'][-20:]} - {str(e)}"
+            )
+        return result, success, time.time() - start_time
 
-    def run_batch(self, temperature=0.0, top_p=0.8, qps=10):
+    def run_batch(self, data, temperature=0.0, top_p=0.8, qps=10):
         """
         启动批量请求运行，包含多线程逻辑和 QPS 控制
         """
-        start_time = time.time()
-
-        data_size = self.stats["total"]
+        data_size = len(data)
         max_workers = min(data_size, max(1, min(10, qps * 2)))
 
         logger.debug(
             f"启动批量处理: 数据量={data_size}, QPS={qps}, 线程数={max_workers}"
         )
 
-        # 创建线程池
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            workers = [
-                executor.submit(self.worker, temperature, top_p)
-                for _ in range(max_workers)
-            ]
-
-            self.queue.join()
-
-            # 发送结束信号
-            for _ in range(max_workers):
-                self.queue.put(None)
+        results = ["Error: Result not found"] * data_size
+        if not data_size:
+            return results
 
-            self.stop_event.set()
-
-        self.pbar.close()
-
-        results = []
-        for i in range(data_size):
-            if i in self.results:
-                results.append(self.results[i])
-            else:
-                results.append("Error: Result not found")
+        pbar = tqdm(total=data_size, desc="Processing API Requests", mininterval=0.5)
+        # Results, stats and the progress bar are only touched by this thread
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self._one, i, messages, temperature, top_p): i
+                for i, messages in enumerate(data)
+            }
+            for future in as_completed(futures):
+                result, success, response_time = future.result()
+                results[futures[future]] = result
+                if success:
+                    self.stats["success"] += 1
+                    self.stats["total_time"] += response_time
+                    pbar.update(1)
+                else:
+                    self.stats["fail"] += 1
 
+        pbar.close()
         return results
 
 
 class APIModel(APIInferenceBase):
+    def __init__(
+        self,
+        url="https://api.openai.com/v1/chat/completions",
+        api_key=None,
+        model="gpt-3.5-turbo",
+        inference_mode=False,
+        max_retries=10,
+        retry_delay=1.0,
+        retry_backoff=2.0,
+        timeout=300,
+        deduplicate=True,
+    ):
+        super().__init__(
+            url,
+            api_key,
+            model,
+            inference_mode,
+            max_retries,
+            retry_delay,
+            retry_backoff,
+            deduplicate=deduplicate,
+        )
+        self.timeout = timeout
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        # Keep-alive session shared by all worker threads; run_batch never
+        # starts more than 10 workers, so the pool holds a connection for each
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
     def generate(
         self,
         messages: List[Dict[str, str]],
@@ -343,11 +328,6 @@ class APIModel(APIInferenceBase):
         top_p=1,
     ):
         def _make_request():
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-
             query = {
                 "model": self.model,
                 "temperature": temperature,
@@ -355,7 +335,12 @@ class APIModel(APIInferenceBase):
                 "messages": messages,
                 "stream": False,
             }
-            response = requests.post(self.url, headers=headers, json=query)
+            response = self.session.post(
+                self.url,
+                headers=self._headers,
+                data=_dumps_body(query),
+                timeout=self.timeout,
+            )
 
             # 检查HTTP状态码
             if response.status_code != 200:
@@ -363,7 +348,7 @@ class APIModel(APIInferenceBase):
                     f"HTTP {response.status_code}: {response.text}"
                 )
 
-            response_json = response.json()
+            response_json = _loads_response(response.content)
             if "choices" not in response_json:
                 logger.error(f"Unexpected response format: {messages}")
                 logger.error(f"Response: {response_json}")
@@ -384,15 +369,26 @@ class OpenAIModel(APIInferenceBase):
         max_retries=20,
         retry_delay=1.0,
         retry_backoff=2.0,
+        deduplicate=True,
     ):
         if not OPENAI_AVAILABLE:
             raise ImportError(
                 "OpenAI is not installed. Please install it with: pip install openai"
             )
         super().__init__(
-            url, api_key, model, inference_mode, max_retries, retry_delay, retry_backoff
+            url,
+            api_key,
+            model,
+            inference_mode,
+            max_retries,
+            retry_delay,
+            retry_backoff,
+            deduplicate=deduplicate,
+        )
+        # _retry_with_backoff owns retries; SDK retries would multiply them
+        self.client = openai.Client(
+            api_key=self.api_key, base_url=self.url, max_retries=0
         )
-        self.client = openai.Client(api_key=self.api_key, base_url=self.url)
 
     def generate(
         self,
@@ -411,3 +407,227 @@ class OpenAIModel(APIInferenceBase):
             return completion.choices[0].message.content
 
         return self._retry_with_backoff(_make_request)
+
+
+class AsyncTokenBucket:
+    """asyncio token bucket limiting request starts to `qps` per second."""
+
+    def __init__(self, qps):
+        self.qps = qps
+        self.tokens = qps
+        self.last_refill = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in FIFO order
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.qps, self.tokens + (now - self.last_refill) * self.qps
+                )
+                self.last_refill = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.qps)
+
+
+class AsyncBatchMixin:
+    """
+    Concurrent batch_generate on a single asyncio event loop.
+
+    Subclasses implement `_open_aclient()` (an async context manager whose
+    value is stored in `self.aclient` for the batch) and `agenerate()`; they
+    set `max_concurrency` and, optionally, `max_qps` in `__init__`.
+    """
+
+    max_concurrency = 32
+    max_qps = None
+
+    async def _aretry_with_backoff(self, func, *args, **kwargs):
+        """
+        异步版本的指数退避重试
+        """
+        sleep_time = self.retry_delay
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                if attempt > 0:
+                    sleep_time = self._next_delay(sleep_time)
+                    await asyncio.sleep(sleep_time)
+                return await func(*args, **kwargs)
+            except Exception as e:
+                logger.debug(f"API调用异常: {type(e).__name__}: {str(e)}")
+                if not self._should_retry(e) or attempt == self.max_retries:
+                    logger.error(f"API调用最终失败，不再重试: {str(e)}")
+                    raise
+
+    def _batch_generate(self, data, temperature=0.0, top_p=0.8, batch_size=5):
+        """
+        Batch generate responses with at most `max_concurrency` requests in flight
+
+        Args:
+            data: List of input messages to process
+            temperature: Sampling temperature
+            top_p: Top-p sampling parameter
+            batch_size: Unused, kept for interface compatibility
+        """
+        logger.info(f"Using max concurrency {self.max_concurrency}")
+        return asyncio.run(self._run_async(data, temperature, top_p))
+
+    async def _run_async(self, data, temperature, top_p):
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        bucket = AsyncTokenBucket(self.max_qps) if self.max_qps else None
+        pbar = tqdm(total=len(data), desc="Processing API Requests")
+
+        async def _one(index, messages):
+            async with semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+                try:
+                    result = await self.agenerate(messages, temperature, top_p)
+                except Exception as e:
+                    logger.error(f"请求 {index} 失败: {str(e)}")
+                    result = f"Error: {str(e)}"
+            pbar.update(1)
+            return result
+
+        # Async clients are bound to the running event loop, so open one per batch
+        async with self._open_aclient() as self.aclient:
+            # gather already returns a list ordered like `data`
+            results = await asyncio.gather(
+                *[_one(i, messages) for i, messages in enumerate(data)]
+            )
+        self.aclient = None
+        pbar.close()
+        return results
+
+
+class AsyncAPIModel(AsyncBatchMixin, APIModel):
+    """Raw HTTP chat-completions model dispatched concurrently with aiohttp."""
+
+    def __init__(
+        self,
+        url="https://api.openai.com/v1/chat/completions",
+        api_key=None,
+        model="gpt-3.5-turbo",
+        inference_mode=False,
+        max_retries=10,
+        retry_delay=1.0,
+        retry_backoff=2.0,
+        max_concurrency=32,
+        max_qps=None,
+        timeout=300,
+        deduplicate=True,
+    ):
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "aiohttp is not installed. Please install it with: pip install aiohttp"
+            )
+        super().__init__(
+            url,
+            api_key,
+            model,
+            inference_mode,
+            max_retries,
+            retry_delay,
+            retry_backoff,
+            timeout,
+            deduplicate=deduplicate,
+        )
+        self.max_concurrency = max_concurrency
+        self.max_qps = max_qps
+        self.aclient = None
+
+    def _open_aclient(self):
+        # One pooled keep-alive session shared by every request in the batch
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+            headers=self._headers,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+        )
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature=0.7,
+        top_p=1,
+    ):
+        async def _make_request():
+            query = {
+                "model": self.model,
+                "temperature": temperature,
+                "top_p": top_p,
+                "messages": messages,
+                "stream": False,
+            }
+            async with self.aclient.post(self.url, data=_dumps_body(query)) as response:
+                # 检查HTTP状态码
+                if response.status != 200:
+                    raise requests.exceptions.HTTPError(
+                        f"HTTP {response.status}: {await response.text()}"
+                    )
+                response_json = _loads_response(await response.read())
+
+            if "choices" not in response_json:
+                logger.error(f"Unexpected response format: {messages}")
+                logger.error(f"Response: {response_json}")
+                raise ValueError("Invalid response format: 'choices' not found")
+
+            return response_json["choices"][0]["message"]["content"]
+
+        return await self._aretry_with_backoff(_make_request)
+
+
+class OpenAIAsyncModel(AsyncBatchMixin, OpenAIModel):
+    """OpenAI-compatible model that dispatches a batch concurrently with asyncio."""
+
+    def __init__(
+        self,
+        url="https://api.openai.com/v1/completions",
+        api_key=None,
+        model="gpt-3.5-turbo",
+        inference_mode=False,
+        max_retries=20,
+        retry_delay=1.0,
+        retry_backoff=2.0,
+        max_concurrency=32,
+        max_qps=None,
+        deduplicate=True,
+    ):
+        super().__init__(
+            url,
+            api_key,
+            model,
+            inference_mode,
+            max_retries,
+            retry_delay,
+            retry_backoff,
+            deduplicate=deduplicate,
+        )
+        self.max_concurrency = max_concurrency
+        self.max_qps = max_qps
+        self.aclient = None
+
+    def _open_aclient(self):
+        # _aretry_with_backoff owns retries; SDK retries would multiply them
+        return openai.AsyncOpenAI(api_key=self.api_key, base_url=self.url, max_retries=0)
+
+    async def agenerate(
+        self,
+        messages: List[Dict[str, str]],
+        temperature=0.7,
+        top_p=1,
+    ):
+        async def _make_request():
+            completion = await self.aclient.chat.completions.create(
+                model=self.model,
+                temperature=temperature,
+                top_p=top_p,
+                messages=messages,
+                stream=False,
+            )
+            return completion.choices[0].message.content
+
+        return await self._aretry_with_backoff(_make_request)
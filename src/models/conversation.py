@@ -0,0 +1,35 @@
+"""
+Chat message construction shared by the inference backends.
+"""
+
+from typing import Dict, List, Optional
+
+__all__ = ["transfer_dict_conv", "batch_transfer_dict_conv"]
+
+_ROLES = ("user", "assistant")
+
+
+def transfer_dict_conv(
+    inputs: List[str], system: Optional[str] = None
+) -> List[Dict[str, str]]:
+    assert len(inputs) % 2 == 1, "number of rounds must be odd"
+    output_chat_dict = [{"role": "system", "content": system}] if system else []
+    output_chat_dict.extend(
+        {"role": _ROLES[i & 1], "content": content} for i, content in enumerate(inputs)
+    )
+    return output_chat_dict
+
+
+def batch_transfer_dict_conv(
+    batch_inputs: List, system: Optional[str] = None
+) -> List[List[Dict[str, str]]]:
+    """`transfer_dict_conv` over many conversations; a string is one user turn."""
+    head = [{"role": "system", "content": system}] if system else []
+    return [
+        (
+            head + [{"role": "user", "content": inputs}]
+            if isinstance(inputs, str)
+            else transfer_dict_conv(inputs, system)
+        )
+        for inputs in batch_inputs
+    ]
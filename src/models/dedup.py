@@ -0,0 +1,35 @@
+"""
+Prompt de-duplication shared by the inference backends.
+"""
+
+import json
+from typing import Any, Callable, List, Optional, Tuple
+
+__all__ = ["dedup_prompts"]
+
+
+def _canonical_json(prompt: Any) -> str:
+    return json.dumps(prompt, sort_keys=True, ensure_ascii=False)
+
+
+def dedup_prompts(
+    prompts: List[Any], key: Optional[Callable[[Any], Any]] = None
+) -> Tuple[List[Any], List[int]]:
+    """Return the unique prompts and, per prompt, the index of its unique copy.
+
+    Prompts are compared by `key`, which defaults to their canonical JSON
+    encoding. Results for the unique prompts are scattered back with
+    ``[unique_results[i] for i in inverse]``.
+    """
+    key = key or _canonical_json
+    index = {}
+    unique = []
+    inverse = []
+    for prompt in prompts:
+        k = key(prompt)
+        pos = index.get(k)
+        if pos is None:
+            pos = index[k] = len(unique)
+            unique.append(prompt)
+        inverse.append(pos)
+    return unique, inverse
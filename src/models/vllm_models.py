@@ -1,10 +1,14 @@
+import gc
+import json
 import re
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import torch
-from tqdm import tqdm
 
 from ..logger import get_logger
+from ..tokenize_cache import TokenizeCache, tokenize_cached
+from .conversation import batch_transfer_dict_conv, transfer_dict_conv
+from .dedup import _canonical_json, dedup_prompts
 
 logger = get_logger()
 
@@ -18,66 +22,170 @@ except ImportError:
     raise ValueError("vLLM is not installed. Please install it with: pip install vllm")
 
 
-def transfer_dict_conv(
-    inputs: List[str], system: Optional[str] = None
-) -> List[Dict[str, str]]:
-    assert len(inputs) % 2 == 1, "number of rounds must be odd"
-    output_chat_dict = [{"role": "system", "content": system}] if system else []
+# Prompts are submitted sorted by this many leading token ids, so requests
+# sharing a prefix run together and hit vLLM's prefix cache
+_PREFIX_SORT_TOKENS = 256
 
-    for i in range(len(inputs)):
-        if i % 2 == 0:
-            output_chat_dict.append({"role": "user", "content": inputs[i]})
-        elif i % 2 == 1:
-            output_chat_dict.append({"role": "assistant", "content": inputs[i]})
-    return output_chat_dict
+# Upper bound on memoized chat-template renderings per wrapper
+_TEMPLATE_MEMO_SIZE = 100_000
+
+# Non-greedy so text between separate think blocks is kept
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL)
 
 
 class CommonModelVllm:
-    def __init__(self, plm="/mntnlp/common_base_model/Qwen__Qwen2.5-7B-Instruct"):
+    # Engines shared by every wrapper in the process, keyed by
+    # (plm, dtype, tensor_parallel_size, max_model_len). Wrappers that only
+    # differ in chat template flags reuse the same weights and CUDA graphs.
+    _LLM_CACHE: Dict[Tuple, "LLM"] = {}
+
+    def __init__(
+        self,
+        plm="/mntnlp/common_base_model/Qwen__Qwen2.5-7B-Instruct",
+        tokenize_cache: Optional[TokenizeCache] = None,
+        deduplicate: bool = True,
+    ):
         if not VLLM_AVAILABLE:
             raise ImportError(
                 "vLLM is not installed. Please install it with: pip install vllm"
             )
 
-        self.model = LLM(
-            model=plm,
-            dtype="bfloat16",
-            tensor_parallel_size=torch.cuda.device_count(),
-            max_model_len=8192,
-            enable_prefix_caching=True,
-            trust_remote_code=True,
-            gpu_memory_utilization=0.9,
-        )
+        self.model_key = (plm, "bfloat16", torch.cuda.device_count(), 8192)
+        self.model = self._get_llm(self.model_key)
         self.tokenizer = self.model.get_tokenizer()
+        # Prompts are tokenized once and passed as token ids; ids are only
+        # kept across batches when a disk cache is given
+        self.tokenize_cache = tokenize_cache
+        # Generate identical prompts once; disable to sample duplicates independently
+        self.deduplicate = deduplicate
+        # Rendered prompts by conversation, valid for one tokenizer and set of
+        # template flags; repeated passes over a dataset skip the template
+        self._template_memo = {}
+        self._template_owner = None
+
+    @classmethod
+    def _get_llm(cls, key: Tuple) -> "LLM":
+        """Return the shared engine for `key`, loading it on first use."""
+        model = cls._LLM_CACHE.get(key)
+        if model is None:
+            plm, dtype, tp_size, max_model_len = key
+            model = LLM(
+                model=plm,
+                dtype=dtype,
+                tensor_parallel_size=tp_size,
+                max_model_len=max_model_len,
+                enable_prefix_caching=True,
+                trust_remote_code=True,
+                gpu_memory_utilization=0.9,
+            )
+            cls._LLM_CACHE[key] = model
+        else:
+            logger.info(f"Reusing loaded vLLM engine for {key[0]}")
+        return model
+
+    @classmethod
+    def release_model(cls, key: Tuple) -> None:
+        """Drop the shared engine for `key` so its GPU memory can be freed.
+
+        Wrappers still holding the engine keep it alive until they are deleted.
+        """
+        if cls._LLM_CACHE.pop(key, None) is not None:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+
+    def _prepare_inputs(self, texts):
+        """Turn rendered prompts into pre-tokenized vLLM inputs."""
+        if self.tokenize_cache is None:
+            token_ids = [self.tokenizer.encode(text) for text in texts]
+        else:
+            token_ids = tokenize_cached(self.tokenizer, texts, self.tokenize_cache)
+        return [{"prompt_token_ids": ids} for ids in token_ids]
 
     def batch_generate(
-        self, data, temperature=0.0, system="", top_p=0.8, batch_size=16
+        self,
+        data,
+        temperature=0.0,
+        system="",
+        top_p=0.8,
+        max_tokens=800,
+        stop=None,
+        batch_size=16,
     ):
+        # max_tokens bounds the decode budget the scheduler plans for; keep it
+        # close to the expected answer length for higher throughput
         sampling_params = SamplingParams(
-            temperature=temperature, top_p=top_p, max_tokens=800
+            temperature=temperature, top_p=top_p, max_tokens=max_tokens, stop=stop
         )
+        # batch_size is kept for interface compatibility; vLLM batches itself
+        prompts = self._build_prompts(data, system)
+        if not self.deduplicate:
+            return self._run_vllm_batch(self._prepare_inputs(prompts), sampling_params)
+        # Templated prompts are plain strings, so they are their own key
+        unique, inverse = dedup_prompts(prompts, key=str)
+        if len(unique) < len(prompts):
+            logger.info(f"Deduplicated {len(prompts)} prompts to {len(unique)} unique")
+        results = self._run_vllm_batch(self._prepare_inputs(unique), sampling_params)
+        return [results[i] for i in inverse]
+
+    def _chat_template_kwargs(self) -> Dict:
+        """Extra `apply_chat_template` arguments; overridden by subclasses."""
+        return {}
+
+    def _build_prompts(self, data, system=""):
+        """Render the inputs to prompt strings with one batched chat template call.
+
+        Plain strings are wrapped as single-turn conversations (with `system`
+        as the system prompt, if given); message lists are used as they are.
+        """
         if isinstance(data[0], str):
-            data = list(map(self.process_special_token, range(len(data))))
-        elif isinstance(data[0], list):
-            data = self.tokenizer.apply_chat_template(
-                data, tokenize=False, add_generation_prompt=True
-            )
-        else:
+            data = batch_transfer_dict_conv(data, system)
+        elif not isinstance(data[0], list):
             raise ValueError("data must be a list of strings or a list of lists")
 
-        generate_result = []
-
-        for i in tqdm(range(0, len(data), batch_size)):
-            model_inputs = data[i : i + batch_size]
-            generated_ids = self.model.generate(
-                model_inputs, sampling_params, use_tqdm=False
+        template_kwargs = self._chat_template_kwargs()
+        owner = (id(self.tokenizer), json.dumps(template_kwargs, sort_keys=True))
+        if owner != self._template_owner:
+            self._template_memo.clear()
+            self._template_owner = owner
+        memo = self._template_memo
+
+        keys = [_canonical_json(conv) for conv in data]
+        missing = {}
+        for conv, key in zip(data, keys):
+            if key not in memo:
+                missing[key] = conv
+        if missing:
+            if len(memo) + len(missing) > _TEMPLATE_MEMO_SIZE:
+                memo.clear()
+            rendered = self.tokenizer.apply_chat_template(
+                list(missing.values()),
+                tokenize=False,
+                add_generation_prompt=True,
+                **template_kwargs,
             )
-
-            for output in generated_ids:
-                generate_result.append(output.outputs[0].text)
-            torch.cuda.empty_cache()
-            if i == 0:
-                logger.info(f"First generated result: {generate_result[0]}")
+            memo.update(zip(missing, rendered))
+        return [memo[key] for key in keys]
+
+    def _run_vllm_batch(self, model_inputs, sampling_params):
+        """Generate for every input in a single LLM.generate call.
+
+        vLLM schedules the whole list with continuous batching, which keeps the
+        GPU busier than feeding it fixed-size chunks. Inputs are submitted in
+        token-prefix order and the outputs returned in the original order.
+        """
+        order = sorted(
+            range(len(model_inputs)),
+            key=lambda i: model_inputs[i]["prompt_token_ids"][:_PREFIX_SORT_TOKENS],
+        )
+        outputs = self.model.generate(
+            [model_inputs[i] for i in order], sampling_params, use_tqdm=True
+        )
+        generate_result = [None] * len(order)
+        for i, output in zip(order, outputs):
+            generate_result[i] = output.outputs[0].text
+        if generate_result:
+            logger.info(f"First generated result: {generate_result[0]}")
         return generate_result
 
     def single_generate(self, prompt):
@@ -88,122 +196,36 @@ class CommonModelVllm:
         generated_ids = self.model.generate(model_inputs, self.sampling_params)
         return self.tokenizer.decode(generated_ids[0].outputs[0].text)
 
-    def process_special_token(self, text, system):
-        return self.tokenizer.apply_chat_template(
-            transfer_dict_conv([text], system),
-            tokenize=False,
-            add_generation_prompt=True,
-        )
+    def process_special_token(self, text, system=""):
+        """Render a single prompt; batch_generate uses `_build_prompts` instead."""
+        return self._build_prompts([text], system)[0]
 
 
 class InferModelVllm(CommonModelVllm):
-    def batch_generate(
-        self, data, temperature=0.0, system="", top_p=0.8, batch_size=16
-    ):
-        sampling_params = SamplingParams(
-            temperature=temperature, top_p=top_p, max_tokens=800
-        )
-        if isinstance(data[0], str):
-            data = list(map(self.process_special_token, range(len(data))))
-        elif isinstance(data[0], list):
-            data = self.tokenizer.apply_chat_template(
-                data, tokenize=False, add_generation_prompt=True
-            )
-        else:
-            raise ValueError("data must be a list of strings or a list of lists")
-
-        generate_result = []
+    def extract_answer(self, answer):
+        return _THINK_RE.sub("", answer).strip()
 
-        for i in tqdm(range(0, len(data), batch_size)):
-            model_inputs = data[i : i + batch_size]
-            generated_ids = self.model.generate(
-                model_inputs, sampling_params, use_tqdm=False
-            )
+    def batch_extract_answer(self, answers: List[str]) -> List[str]:
+        sub = _THINK_RE.sub
+        return [sub("", answer).strip() for answer in answers]
 
-            for output in generated_ids:
-                generate_result.append(output.outputs[0].text)
-            torch.cuda.empty_cache()
-            if i == 0:
-                logger.info(f"First generated result: {generate_result[0]}")
-        return generate_result
-
-    def extract_anwer(self, answer):
-        return re.sub(r"<think>.*</think>", "", answer, flags=re.DOTALL).strip()
+    # Backward-compatible alias for the old misspelled name
+    extract_anwer = extract_answer
 
 
 class Qwen3Vllm(CommonModelVllm):
-    def __init__(self, plm, think_mode):
-        super().__init__(plm)
+    def __init__(self, plm, think_mode, tokenize_cache=None, deduplicate=True):
+        super().__init__(plm, tokenize_cache=tokenize_cache, deduplicate=deduplicate)
         self.think_mode = think_mode
 
-    def batch_generate(
-        self, data, temperature=0.0, system="", top_p=0.8, batch_size=16
-    ):
-        sampling_params = SamplingParams(
-            temperature=temperature, top_p=top_p, max_tokens=800
-        )
-        if isinstance(data[0], str):
-            data = list(map(self.process_special_token, range(len(data))))
-        elif isinstance(data[0], list):
-            data = self.tokenizer.apply_chat_template(
-                data,
-                tokenize=False,
-                add_generation_prompt=True,
-                enable_thinking=self.think_mode,
-            )
-        else:
-            raise ValueError("data must be a list of strings or a list of lists")
-
-        generate_result = []
-
-        for i in tqdm(range(0, len(data), batch_size)):
-            model_inputs = data[i : i + batch_size]
-            generated_ids = self.model.generate(
-                model_inputs, sampling_params, use_tqdm=False
-            )
-
-            for output in generated_ids:
-                generate_result.append(output.outputs[0].text)
-            torch.cuda.empty_cache()
-            if i == 0:
-                logger.info(f"First generated result: {generate_result[0]}")
-        return generate_result
+    def _chat_template_kwargs(self) -> Dict:
+        return {"enable_thinking": self.think_mode}
 
 
 class HiragVllm(CommonModelVllm):
-    def __init__(self, plm, think_mode):
-        super().__init__(plm)
+    def __init__(self, plm, think_mode, tokenize_cache=None, deduplicate=True):
+        super().__init__(plm, tokenize_cache=tokenize_cache, deduplicate=deduplicate)
         self.think_mode = think_mode
 
-    def batch_generate(
-        self, data, temperature=0.0, system="", top_p=0.8, batch_size=16
-    ):
-        sampling_params = SamplingParams(
-            temperature=temperature, top_p=top_p, max_tokens=800
-        )
-        if isinstance(data[0], str):
-            data = list(map(self.process_special_token, range(len(data))))
-        elif isinstance(data[0], list):
-            data = self.tokenizer.apply_chat_template(
-                data,
-                tokenize=False,
-                add_generation_prompt=True,
-                add_think_prompt=self.think_mode,
-            )
-        else:
-            raise ValueError("data must be a list of strings or a list of lists")
-
-        generate_result = []
-
-        for i in tqdm(range(0, len(data), batch_size)):
-            model_inputs = data[i : i + batch_size]
-            generated_ids = self.model.generate(
-                model_inputs, sampling_params, use_tqdm=False
-            )
-
-            for output in generated_ids:
-                generate_result.append(output.outputs[0].text)
-            torch.cuda.empty_cache()
-            if i == 0:
-                logger.info(f"First generated result: {generate_result[0]}")
-        return generate_result
+    def _chat_template_kwargs(self) -> Dict:
+        return {"add_think_prompt": self.think_mode}
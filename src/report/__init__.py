@@ -2,14 +2,11 @@
 Report package for evaluation results.
 """
 
+import importlib
+
 from .base_eval import EvalBase
 from .eval_functions import NAME_TO_EVAL_CLASS, evaluate_dataset, get_eval_class
-from .hotpotqa_eval import HotpotQAEval
-from .html_reporter import HTMLReporter
 from .metrics import calculate_accuracy, calculate_exact_match, calculate_f1
-from .musiqueqa_eval import MusiqueQAEval
-from .popqa_eval import PopQAEval
-from .pubmedqa_eval import PubmedQAEval
 from .runner import Runner
 
 __all__ = [
@@ -27,3 +24,26 @@ __all__ = [
     "HTMLReporter",
     "Runner",
 ]
+
+# Per-dataset evaluation classes are imported on first access, like the
+# entries of NAME_TO_EVAL_CLASS; so is the HTML reporter and its template
+_LAZY_ATTRS = {
+    "HTMLReporter": ".html_reporter",
+    "HotpotQAEval": ".hotpotqa_eval",
+    "PopQAEval": ".popqa_eval",
+    "MusiqueQAEval": ".musiqueqa_eval",
+    "PubmedQAEval": ".pubmedqa_eval",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
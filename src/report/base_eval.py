@@ -2,19 +2,26 @@
 Base evaluation classes and shared utilities.
 """
 
-import json
 import os
-from abc import ABC
+import sys
 from pathlib import Path
-from typing import Dict, List
-
-from ..data import EvalResult
+from typing import Dict, List, Optional
+
+from ..data import (
+    EvalResult,
+    JSONDecodeError,
+    ResultsBatch,
+    _json_dumps_indented,
+    _json_dumps_line,
+    _json_loads,
+)
 from ..logger import get_logger
 from .metrics import (
     _is_answer_correct,
-    calculate_accuracy,
+    _is_any_answer_correct,
     calculate_exact_match,
     calculate_f1,
+    normalize_results,
 )
 
 logger = get_logger()
@@ -30,7 +37,25 @@ NAME_TO_TYPE = {
 }
 
 
-class EvalBase(ABC):
+# Evaluation methods used when none are given
+DEFAULT_METHODS = ("acc", "f1", "em")
+
+# Fields every line of a saved results file must have
+_REQUIRED_FIELDS_ORDER = ("id", "query", "answer", "prediction")
+_REQUIRED_FIELDS = frozenset(_REQUIRED_FIELDS_ORDER)
+
+# Number of serialized records written per call in save_results
+_SAVE_CHUNK_SIZE = 1000
+
+
+def _label_answer(answer, prediction) -> bool:
+    """Label a prediction against one answer or a list of accepted answers."""
+    if isinstance(answer, list):
+        return _is_any_answer_correct(answer, prediction)
+    return _is_answer_correct(answer, prediction)
+
+
+class EvalBase:
     """Base evaluation class for all evaluation types."""
 
     def __init__(self, name: str, eval_methods: List[str] = None):
@@ -43,26 +68,37 @@ class EvalBase(ABC):
         """
         self.name = name
         self.eval_type = NAME_TO_TYPE.get(name, "unknown")
-        self.eval_methods = eval_methods or ["acc", "f1", "em"]
+        # Interned, so method dispatch and score keys compare by identity
+        self.eval_methods = (
+            tuple(map(sys.intern, eval_methods)) if eval_methods else DEFAULT_METHODS
+        )
         self.results: List[EvalResult] = []
         self.scores: Dict[str, float] = {}
         self.calculate_score_state: bool = False
+        # Per-result correctness, computed on first use and reset on add
+        self._correct_mask: Optional[List[bool]] = None
 
     def add_result(self, result: EvalResult):
-        """Add an evaluation result."""
-        # breakpoint()
-        if isinstance(result.answer, list):
-            result.set_label(
-                any(_is_answer_correct(ans, result.prediction) for ans in result.answer)
-            )
-        else:
-            result.set_label(_is_answer_correct(result.answer, result.prediction))
+        """Add an evaluation result, labelling it unless it already has a label."""
+        if result.label is None:
+            result.set_label(_label_answer(result.answer, result.prediction))
         self.results.append(result)
+        self._correct_mask = None
+
+    def add_batch(self, batch: ResultsBatch):
+        """Add a column-wise batch of results, labelling them in one pass."""
+        batch.labels = list(map(_label_answer, batch.answers, batch.predictions))
+        self.results.extend(batch.to_results())
+        self._correct_mask = None
 
     def add_results(self, results: List[EvalResult]):
-        """Add multiple evaluation results."""
+        """Add multiple evaluation results, labelling the unlabelled ones."""
+        label_answer = _label_answer
         for res in results:
-            self.add_result(res)
+            if res.label is None:
+                res.set_label(label_answer(res.answer, res.prediction))
+        self.results.extend(results)
+        self._correct_mask = None
 
     def calculate_scores(self) -> Dict[str, float]:
         """Calculate scores for all evaluation methods."""
@@ -70,26 +106,47 @@ class EvalBase(ABC):
             logger.warning(f"No results to evaluate for {self.name}")
             return {}
 
+        methods = self.eval_methods
+        # F1 and EM share one lower/strip pass over answers and predictions
+        normalized = (
+            normalize_results(self.results)
+            if "f1" in methods or "em" in methods
+            else None
+        )
         scores = {}
-        for method in self.eval_methods:
+        for method in methods:
             if method == "acc":
-                scores["acc"] = calculate_accuracy(self.results)
+                # Accuracy is the share of results labelled correct, so the
+                # labels computed on add are aggregated instead of re-scored
+                mask = self._get_correct_mask()
+                scores["acc"] = sum(mask) / len(mask)
             elif method == "f1":
-                scores["f1"] = calculate_f1(self.results)
+                scores["f1"] = calculate_f1(self.results, normalized)
             elif method == "em":
-                scores["em"] = calculate_exact_match(self.results)
+                scores["em"] = calculate_exact_match(self.results, normalized)
 
         self.scores = scores
         self.calculate_score_state = True
         return scores
 
+    def _get_correct_mask(self) -> List[bool]:
+        """Return `_is_correct` for every result, evaluated once per result set."""
+        mask = self._correct_mask
+        # The length check also catches results appended to self.results directly
+        if mask is None or len(mask) != len(self.results):
+            is_correct = self._is_correct
+            mask = self._correct_mask = [is_correct(result) for result in self.results]
+        return mask
+
     def get_correct_answers(self) -> List[EvalResult]:
         """Get all correct answers."""
-        return [result for result in self.results if self._is_correct(result)]
+        mask = self._get_correct_mask()
+        return [result for result, correct in zip(self.results, mask) if correct]
 
     def get_incorrect_answers(self) -> List[EvalResult]:
         """Get all incorrect answers."""
-        return [result for result in self.results if not self._is_correct(result)]
+        mask = self._get_correct_mask()
+        return [result for result, correct in zip(self.results, mask) if not correct]
 
     def get_total_score(self) -> float:
         """Get the average score across all evaluation methods."""
@@ -103,7 +160,8 @@ class EvalBase(ABC):
 
     def get_error_ids(self) -> List[str]:
         """Get IDs of all incorrect answers."""
-        return [result.id for result in self.get_incorrect_answers()]
+        mask = self._get_correct_mask()
+        return [result.id for result, correct in zip(self.results, mask) if not correct]
 
     def get_corresponding_datapreprocess_type(self):
         """Get corresponding data preprocess type."""
@@ -111,24 +169,16 @@ class EvalBase(ABC):
 
     def save_results_score(self, file_path: str):
         """Save evaluation results to file."""
-        scores_dict = {}
-        for method in self.eval_methods:
-            if method in self.scores:
-                scores_dict[method] = self.scores[method]
-            else:
-                scores_dict[method] = None
-
+        scores = self.scores
         output_data = {
             "name": self.name,
             "class": self.eval_type,
-            "scores": scores_dict,
+            "scores": {method: scores.get(method) for method in self.eval_methods},
             "error_id": self.get_error_ids(),
         }
 
-        with open(file_path, "w", encoding="utf-8") as f:
-            import json
-
-            json.dump(output_data, f, indent=2, ensure_ascii=False)
+        with open(file_path, "wb") as f:
+            f.write(_json_dumps_indented(output_data))
 
         logger.info(f"Evaluation results saved to {file_path}")
 
@@ -149,31 +199,38 @@ class EvalBase(ABC):
             return
 
         try:
-            with open(output_path, mode, encoding="utf-8") as f:
-                # Use tqdm to show progress
-                for result in results_to_save:
-                    # Create data dictionary
-                    data = {
-                        "id": result.id,
-                        "query": result.query,
-                        "prompt": result.prompt,
-                        "answer": result.answer,
-                        "prediction": result.prediction,
-                        "label": result.label,
-                    }
-
-                    try:
-                        # Write one line
-                        f.write(json.dumps(data, ensure_ascii=False) + "\n")
-                    except Exception as e:
-                        logger.error(f"Error writing line: {e}")
-                        logger.error(f"Problematic data: {data}")
-                        continue
-
+            f = open(output_path, mode + "b", buffering=1 << 20)
         except Exception as e:
             logger.error(f"Error opening file {output_path}: {e}")
             raise
 
+        # Records are serialized into chunks so each write call carries many
+        # lines while peak memory stays bounded for large result sets
+        with f:
+            chunk = []
+            for result in results_to_save:
+                # Create data dictionary
+                data = {
+                    "id": result.id,
+                    "query": result.query,
+                    "prompt": result.prompt,
+                    "answer": result.answer,
+                    "prediction": result.prediction,
+                    "label": result.label,
+                }
+
+                try:
+                    chunk.append(_json_dumps_line(data))
+                except Exception as e:
+                    logger.error(f"Error writing line: {e}")
+                    logger.error(f"Problematic data: {data}")
+                    continue
+
+                if len(chunk) >= _SAVE_CHUNK_SIZE:
+                    f.write(b"".join(chunk))
+                    chunk.clear()
+            f.write(b"".join(chunk))
+
         logger.info(
             f"Successfully saved {len(results_to_save)} items to \033[31m{output_path}\033[0m"
         )
@@ -211,42 +268,41 @@ class EvalBase(ABC):
         loaded_results = []
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
+            # orjson (when installed) parses the raw bytes; JSON allows the
+            # trailing newline, so lines are only stripped to skip blank ones
+            with open(file_path, "rb") as f:
                 for line_num, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:  # Skip empty lines
+                    if not line.strip():  # Skip empty lines
                         continue
 
                     try:
-                        data = json.loads(line)
-
-                        # Validate required fields
-                        required_fields = ["id", "query", "answer", "prediction"]
-                        missing_fields = [
-                            field for field in required_fields if field not in data
-                        ]
-                        if missing_fields:
+                        data = _json_loads(line)
+
+                        # Validate required fields; the subset test is one C call
+                        if not _REQUIRED_FIELDS.issubset(data):
+                            missing_fields = [
+                                field
+                                for field in _REQUIRED_FIELDS_ORDER
+                                if field not in data
+                            ]
                             logger.warning(
                                 f"Line {line_num}: Missing required fields: {missing_fields}"
                             )
                             continue
 
-                        # Create EvalResult object
+                        # Create EvalResult object; prompt might be optional and
+                        # the label is kept when it was saved
                         result = EvalResult(
-                            id=data["id"],
-                            query=data["query"],
-                            prompt=data.get("prompt", ""),  # prompt might be optional
-                            answer=data["answer"],
-                            prediction=data["prediction"],
+                            data["id"],
+                            data["query"],
+                            data.get("prompt", ""),
+                            data["answer"],
+                            data["prediction"],
+                            data.get("label"),
                         )
-
-                        # Set label if it exists in the data
-                        if "label" in data and data["label"] is not None:
-                            result.set_label(data["label"])
-
                         loaded_results.append(result)
 
-                    except json.JSONDecodeError as e:
+                    except JSONDecodeError as e:
                         logger.error(f"Line {line_num}: Invalid JSON format - {e}")
                         continue
                     except Exception as e:
@@ -260,8 +316,8 @@ class EvalBase(ABC):
         if not loaded_results:
             logger.warning(f"No valid results loaded from {file_path}")
         else:
-            # Add all results to the instance
-            # Note: add_results will automatically calculate labels if not already set
+            # Add all results to the instance; saved labels are kept and only
+            # results without one are labelled
             instance.add_results(loaded_results)
             logger.info(
                 f"Successfully loaded {len(loaded_results)} results from {file_path}"
@@ -278,9 +334,13 @@ class EvalBase(ABC):
             self.calculate_scores()
         print(f"\n=== Evaluation Summary for {self.name} ===")
         print(f"Dataset Type: {self.eval_type}")
+        # One pass over the correctness mask serves every count below
+        mask = self._get_correct_mask()
+        n_correct = sum(mask)
+        error_ids = self.get_error_ids()
         print(f"Total Samples: {len(self.results)}")
-        print(f"Correct Answers: {len(self.get_correct_answers())}")
-        print(f"Incorrect Answers: {len(self.get_incorrect_answers())}")
+        print(f"Correct Answers: {n_correct}")
+        print(f"Incorrect Answers: {len(mask) - n_correct}")
 
         if self.scores:
             print(f"Scores:")
@@ -288,11 +348,17 @@ class EvalBase(ABC):
                 print(f"  {method.upper()}: {score:.4f}")
             print(f"Total Score: {self.get_total_score():.4f}")
 
-        if self.get_error_ids():
-            print(
-                f"Error IDs: {self.get_error_ids()[:5]}{'...' if len(self.get_error_ids()) > 5 else ''}"
-            )
+        if error_ids:
+            print(f"Error IDs: {error_ids[:5]}{'...' if len(error_ids) > 5 else ''}")
 
     def _is_correct(self, result: EvalResult) -> bool:
-        """Check if the prediction is correct (to be implemented by subclasses)."""
-        raise NotImplementedError("Subclasses must implement _is_correct method")
+        """Check if the prediction is correct.
+
+        The label computed when the result was added is authoritative; results
+        without one are labelled on the fly. Dataset classes do not override
+        this; the correct/incorrect scans read the label directly.
+        """
+        label = result.label
+        if label is None:
+            label = _label_answer(result.answer, result.prediction)
+        return bool(label)
@@ -1,32 +1,61 @@
+import importlib
+from collections.abc import Mapping
 from typing import List, Optional
 
 from ..data import EvalResult
 from .base_eval import EvalBase
-from .hotpotqa_eval import HotpotQAEval
-from .musiqueqa_eval import MusiqueQAEval
-from .popqa_eval import PopQAEval
-from .pubmedqa_eval import PubmedQAEval
-from .triviaqa_eval import TriviaQAEval
-from .twowiki_eval import TwoWIKIEval
 
-# Mapping from dataset names to evaluation classes
-NAME_TO_EVAL_CLASS = {
-    "hotpotqa": HotpotQAEval,
-    "popqa": PopQAEval,
-    "musiqueqa": MusiqueQAEval,
-    "pubmedqa": PubmedQAEval,
-    "2wiki": TwoWIKIEval,
-    "triviaqa": TriviaQAEval,
+# Dataset name -> (module, class name) of its evaluation class
+_EVAL_CLASS_PATHS = {
+    "hotpotqa": (".hotpotqa_eval", "HotpotQAEval"),
+    "popqa": (".popqa_eval", "PopQAEval"),
+    "musiqueqa": (".musiqueqa_eval", "MusiqueQAEval"),
+    "pubmedqa": (".pubmedqa_eval", "PubmedQAEval"),
+    "2wiki": (".twowiki_eval", "TwoWIKIEval"),
+    "triviaqa": (".triviaqa_eval", "TriviaQAEval"),
 }
 
 
+class _LazyEvalRegistry(Mapping):
+    """Read-only name -> eval class mapping that imports each class on first use.
+
+    Membership tests and iteration only look at the names, so callers that
+    evaluate a single dataset never import the other evaluation modules.
+    """
+
+    def __init__(self, paths):
+        self._paths = paths
+        self._resolved = {}
+
+    def __getitem__(self, name):
+        eval_class = self._resolved.get(name)
+        if eval_class is None:
+            module_name, class_name = self._paths[name]
+            module = importlib.import_module(module_name, __package__)
+            eval_class = self._resolved[name] = getattr(module, class_name)
+        return eval_class
+
+    def __contains__(self, name):
+        return name in self._paths
+
+    def __iter__(self):
+        return iter(self._paths)
+
+    def __len__(self):
+        return len(self._paths)
+
+
+# Mapping from dataset names to evaluation classes
+NAME_TO_EVAL_CLASS = _LazyEvalRegistry(_EVAL_CLASS_PATHS)
+
+
 def get_eval_class(dataset_name: str, eval_methods: List[str] = None) -> EvalBase:
     """Get the appropriate evaluation class for a dataset."""
     if dataset_name not in NAME_TO_EVAL_CLASS:
         raise ValueError(f"Unknown dataset: {dataset_name}")
 
     eval_class = NAME_TO_EVAL_CLASS[dataset_name]
-    return eval_class(eval_methods)
+    return eval_class(eval_methods=eval_methods)
 
 
 def evaluate_dataset(
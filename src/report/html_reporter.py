@@ -2,60 +2,75 @@
 HTML report generator for evaluation results.
 """
 
+import functools
+import hashlib
 import json
 import os
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from jinja2 import BaseLoader, Environment
+from markupsafe import Markup, escape
 
 from ..logger import get_logger
 
 logger = get_logger()
 
+# orjson is optional; it serializes the embedded JSON faster than the stdlib
+try:
+    import orjson
 
-class HTMLReporter:
-    """Generate HTML reports for evaluation results."""
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-    def __init__(self, output_dir: str = "reports"):
-        self.output_dir = output_dir
-        os.makedirs(output_dir, exist_ok=True)
 
-    def generate_report(self, results: Dict[str, Any], filename: str = None) -> str:
-        """
-        Generate HTML report from evaluation results.
+def _json_dumps(obj: Any, **kwargs: Any) -> str:
+    """Key-sorted, compact JSON text for the template's ``tojson`` filter."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            # e.g. non-string keys, which orjson rejects
+            pass
+    return json.dumps(obj, **kwargs)
 
-        Args:
-            results: Dictionary containing evaluation results for all datasets
-            filename: Optional filename for the report
 
-        Returns:
-            str: Path to the generated HTML file
-        """
-        if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"evaluation_report_{timestamp}.html"
+# Compiled once at import; autoescape covers dataset names, ids and labels
+_ENV = Environment(
+    loader=BaseLoader(), autoescape=True, trim_blocks=True, lstrip_blocks=True
+)
+# Compact separators for the JSON embedded in error-detail attributes
+_ENV.policies["json.dumps_function"] = _json_dumps
+_ENV.policies["json.dumps_kwargs"] = {"sort_keys": True, "separators": (",", ":")}
 
-        filepath = os.path.join(self.output_dir, filename)
+# Formatted scores keyed by the exact float; reports repeat the same values
+_FMT3: Dict[float, str] = {}
+_FMT3_MAX_SIZE = 4096
 
-        html_content = self._generate_html_content(results)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            f.write(html_content)
+def _fmt3(value: float, _cache: Dict[float, str] = _FMT3) -> str:
+    """Format a score with three decimals, memoizing the result."""
+    text = _cache.get(value)
+    if text is None:
+        if len(_cache) >= _FMT3_MAX_SIZE:
+            _cache.clear()
+        text = _cache[value] = f"{value:.3f}"
+    return text
 
-        logger.info(f"HTML report generated: {filepath}")
-        return filepath
 
-    def _generate_html_content(self, results: Dict[str, Any]) -> str:
-        """Generate the HTML content for the report."""
+@functools.lru_cache(maxsize=256)
+def _label(text: str) -> Markup:
+    """Upper-cased, HTML-escaped label; names and metrics recur across cards."""
+    return escape(str(text).upper())
 
-        # Generate dataset cards
-        dataset_cards = ""
-        for dataset_name, dataset_data in results.items():
-            dataset_cards += self._generate_dataset_card(dataset_name, dataset_data)
 
-        # Generate summary statistics
-        summary_stats = self._generate_summary_stats(results)
+_ENV.filters["fmt3"] = _fmt3
+_ENV.filters["label"] = _label
 
-        html_template = f"""
+_REPORT_SOURCE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
@@ -63,188 +78,188 @@ class HTMLReporter:
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>RAGQA Evaluation Report</title>
     <style>
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             min-height: 100vh;
             padding: 20px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1200px;
             margin: 0 auto;
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             color: white;
             margin-bottom: 30px;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             font-size: 2.5em;
             margin-bottom: 10px;
             text-shadow: 2px 2px 4px rgba(0,0,0,0.3);
-        }}
+        }
         
-        .header p {{
+        .header p {
             font-size: 1.2em;
             opacity: 0.9;
-        }}
+        }
         
-        .summary-section {{
+        .summary-section {
             background: white;
             border-radius: 15px;
             padding: 25px;
             margin-bottom: 30px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
-        }}
+        }
         
-        .summary-grid {{
+        .summary-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 20px;
             margin-top: 20px;
-        }}
+        }
         
-        .summary-item {{
+        .summary-item {
             text-align: center;
             padding: 20px;
             background: #f8f9fa;
             border-radius: 10px;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .summary-item h3 {{
+        .summary-item h3 {
             color: #667eea;
             margin-bottom: 10px;
-        }}
+        }
         
-        .summary-item .value {{
+        .summary-item .value {
             font-size: 2em;
             font-weight: bold;
             color: #333;
-        }}
+        }
         
-        .datasets-grid {{
+        .datasets-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(350px, 1fr));
             gap: 25px;
-        }}
+        }
         
-        .dataset-card {{
+        .dataset-card {
             background: white;
             border-radius: 15px;
             padding: 25px;
             box-shadow: 0 10px 30px rgba(0,0,0,0.1);
             transition: transform 0.3s ease, box-shadow 0.3s ease;
             cursor: pointer;
-        }}
+        }
         
-        .dataset-card:hover {{
+        .dataset-card:hover {
             transform: translateY(-5px);
             box-shadow: 0 15px 40px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .dataset-header {{
+        .dataset-header {
             display: flex;
             justify-content: space-between;
             align-items: center;
             margin-bottom: 20px;
-        }}
+        }
         
-        .dataset-name {{
+        .dataset-name {
             font-size: 1.5em;
             font-weight: bold;
             color: #333;
             margin-left: -8px;
-        }}
+        }
         
-        .dataset-type {{
+        .dataset-type {
             background: #667eea;
             color: white;
             padding: 5px 15px;
             border-radius: 20px;
             font-size: 0.9em;
-        }}
+        }
         
-        .scores-section {{
+        .scores-section {
             margin-bottom: 20px;
-        }}
+        }
         
-        .score-item {{
+        .score-item {
             display: flex;
             justify-content: space-between;
             align-items: center;
             padding: 10px 0;
             border-bottom: 1px solid #eee;
-        }}
+        }
         
-        .score-item:last-child {{
+        .score-item:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .score-label {{
+        .score-label {
             font-weight: 500;
             color: #666;
             text-transform: uppercase;
             letter-spacing: 0.5px;
-        }}
+        }
         
-        .score-value {{
+        .score-value {
             font-weight: bold;
             font-size: 1.1em;
             color: #333;
-        }}
+        }
         
-        .score-value.high {{
+        .score-value.high {
             color: #28a745;
-        }}
+        }
         
-        .score-value.medium {{
+        .score-value.medium {
             color: #ffc107;
-        }}
+        }
         
-        .score-value.low {{
+        .score-value.low {
             color: #dc3545;
-        }}
+        }
         
-        .error-section {{
+        .error-section {
             margin-top: 20px;
-        }}
+        }
         
-        .error-title {{
+        .error-title {
             font-weight: 500;
             color: #666;
             margin-bottom: 10px;
-        }}
+        }
         
-        .error-list {{
+        .error-list {
             background: #f8f9fa;
             padding: 15px;
             border-radius: 8px;
             max-height: 180px;
             overflow-y: auto;
-        }}
+        }
         
         /* Expand error list more when details is open */
-        details[open] .error-list {{
+        details[open] .error-list {
             max-height: 480px;
-        }}
+        }
         
-        .error-detail {{
+        .error-detail {
             white-space: pre-wrap;
             word-break: break-word;
             line-height: 1.4;
-        }}
+        }
         
-        .error-item {{
+        .error-item {
             background: #fff3cd;
             color: #856404;
             padding: 5px 10px;
@@ -253,24 +268,24 @@ class HTMLReporter:
             font-size: 0.9em;
             border-left: 3px solid #ffc107;
             cursor: pointer;
-        }}
+        }
         
-        .timestamp {{
+        .timestamp {
             text-align: center;
             color: white;
             margin-top: 30px;
             opacity: 0.8;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .datasets-grid {{
+        @media (max-width: 768px) {
+            .datasets-grid {
                 grid-template-columns: 1fr;
-            }}
+            }
             
-            .summary-grid {{
+            .summary-grid {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -279,554 +294,642 @@ class HTMLReporter:
             <h1>🎯 RAGQA Evaluation Report</h1>
             <p>Comprehensive evaluation results for all datasets</p>
         </div>
-        
-        {summary_stats}
-        
+
+        <div class="summary-section">
+            <h2>📊 Summary Statistics</h2>
+            <div class="summary-grid">
+                <div class="summary-item">
+                    <h3>Total Datasets</h3>
+                    <div class="value">{{ summary.total_datasets }}</div>
+                </div>
+                <div class="summary-item">
+                    <h3>Total Samples</h3>
+                    <div class="value">{{ summary.total_samples }}</div>
+                </div>
+                <div class="summary-item">
+                    <h3>Total Errors</h3>
+                    <div class="value">{{ summary.total_errors }}</div>
+                </div>
+                <div class="summary-item">
+                    <h3>Average Accuracy Score (Acc Only)</h3>
+                    <div class="value">{{ summary.avg_acc_score|fmt3 }}</div>
+                </div>
+            </div>
+            {% if summary.type_avgs %}
+            <div style="margin-top: 20px;">
+                <h2>🧩 Average Accuracy Score by Type (Acc Only)</h2>
+                <div class="summary-grid">
+                    {% for dataset_type, type_avg in summary.type_avgs %}
+                    <div class="summary-item">
+                        <h3>{{ dataset_type }}</h3>
+                        <div class="value">{{ type_avg|fmt3 }}</div>
+                    </div>
+                    {% endfor %}
+                </div>
+            </div>
+            {% endif %}
+            {% if summary.chart %}
+            <div class="type-chart-section" style="margin-top: 24px;">
+                <h2>📈 Scores by Type</h2>
+                <div class="type-tabs" style="margin: 10px 0;">
+                    {% for pane in summary.chart %}
+                    <button class="type-tab" data-type="{{ pane.type }}" style="padding:8px 12px;margin:6px;border:1px solid #667eea;border-radius:16px;{% if loop.first %}background:#667eea;color:#fff;{% else %}background:#fff;color:#667eea;{% endif %}cursor:pointer;">{{ pane.type }}</button>
+                    {% endfor %}
+                </div>
+                <div class="chart-container" style="width: 100%; background: #fff; border-radius: 10px; padding: 12px; border: 1px solid #eee;">
+                    <div id="type-legend" class="type-legend" style="display:flex;flex-wrap:wrap;gap:10px;margin-bottom:8px;align-items:center;">
+                        {% for color, label in (("#28a745", ">= AVG"), ("#dc3545", "< AVG")) %}
+                        <div style="display:flex;align-items:center;gap:6px;"><span style="display:inline-block;width:12px;height:12px;background:{{ color }};border-radius:2px;"></span><span style="font-size:12px;color:#495057;">{{ label }}</span></div>
+                        {% endfor %}
+                    </div>
+                    {% for pane in summary.chart %}
+                    <div class="chart-pane" data-type="{{ pane.type }}"{% if not loop.first %} hidden{% endif %}>
+                        <svg width="100%" height="{{ pane.height }}" viewBox="0 0 {{ pane.width }} {{ pane.height }}">
+                            {% for y, label in pane.grid %}
+                            <line x1="{{ pane.left }}" y1="{{ y }}" x2="{{ pane.right }}" y2="{{ y }}" stroke="#e9ecef" stroke-width="1"/>
+                            <text x="{{ pane.left - 8 }}" y="{{ y + 4 }}" text-anchor="end" font-size="11" fill="#6c757d">{{ label }}</text>
+                            {% endfor %}
+                            {% for group in pane.groups %}
+                            <text x="{{ group.label_x }}" y="{{ pane.metric_label_y }}" text-anchor="middle" font-size="12" fill="#495057">{{ group.metric|label }}</text>
+                            <line x1="{{ group.x1 }}" y1="{{ group.avg_y }}" x2="{{ group.x2 }}" y2="{{ group.avg_y }}" stroke="#6c757d" stroke-dasharray="4,3" stroke-width="1.5"/>
+                            {% for bar in group.bars %}
+                            <text x="{{ bar.label_x }}" y="{{ pane.dataset_label_y }}" text-anchor="end" font-size="15" fill="#6c757d" transform="rotate(-45 {{ bar.label_x }} {{ pane.dataset_label_y }})">{{ bar.dataset }}</text>
+                            {% endfor %}
+                            {% endfor %}
+                            {# All bars of one colour are a single path #}
+                            {% for color, path in pane.bar_paths %}
+                            <path d="{{ path }}" fill="{{ color }}" opacity="0.9"/>
+                            {% endfor %}
+                        </svg>
+                    </div>
+                    {% endfor %}
+                </div>
+                <script>
+                (function() {
+                    // Charts are pre-rendered; tabs only switch the visible pane
+                    const container = document.querySelector('.type-chart-section');
+                    const tabs = container.querySelectorAll('.type-tab');
+                    const panes = container.querySelectorAll('.chart-pane');
+                    tabs.forEach(btn => {
+                        btn.addEventListener('click', () => {
+                            const t = btn.dataset.type;
+                            tabs.forEach(b => {
+                                const active = b.dataset.type === t;
+                                b.style.background = active ? '#667eea' : '#fff';
+                                b.style.color = active ? '#fff' : '#667eea';
+                            });
+                            panes.forEach(pane => { pane.hidden = pane.dataset.type !== t; });
+                        });
+                    });
+                })();
+                </script>
+            </div>
+            {% endif %}
+        </div>
+
         <div class="datasets-grid">
-            {dataset_cards}
+            {% for card in cards %}
+{{ card }}
+            {% endfor %}
         </div>
-        
+
         <div class="timestamp">
-            <p>Report generated on {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
+            <p>Report generated on {{ timestamp }}</p>
         </div>
     </div>
-    
+
     <script>
         // Add click functionality to dataset cards
-        document.querySelectorAll('.dataset-card').forEach(card => {{
-            card.addEventListener('click', function() {{
+        document.querySelectorAll('.dataset-card').forEach(card => {
+            card.addEventListener('click', function() {
                 // Add visual feedback
                 this.style.transform = 'scale(0.98)';
-                setTimeout(() => {{
+                setTimeout(() => {
                     this.style.transform = 'translateY(-5px)';
-                }}, 150);
-            }});
-        }});
-        
-        // Add hover effects for score values
-        document.querySelectorAll('.score-value').forEach(score => {{
-            const value = parseFloat(score.textContent);
-            if (!isNaN(value)) {{
-                if (value >= 0.8) {{
-                    score.classList.add('high');
-                }} else if (value >= 0.6) {{
-                    score.classList.add('medium');
-                }} else {{
-                    score.classList.add('low');
-                }}
-            }}
-        }});
+                }, 150);
+            });
+        });
+
+        // Toggle error details; one delegated listener serves every error item
+        document.addEventListener('click', function(evt) {
+            const item = evt.target.closest('.error-item[data-q]');
+            if (!item || evt.target.closest('.error-detail')) return;
+            const wrap = item.querySelector('.error-detail');
+            wrap.style.display = (wrap.style.display === 'none' ? 'block' : 'none');
+            wrap.querySelector('.err-q').textContent = JSON.parse(item.dataset.q);
+            wrap.querySelector('.err-gt').textContent = JSON.parse(item.dataset.gt);
+            wrap.querySelector('.err-pd').textContent = JSON.parse(item.dataset.pd);
+        });
     </script>
 </body>
 </html>
+"""
+
+# One dataset card, rendered on its own so unchanged cards can be reused. The
+# lines keep the page's indentation; the page adds the trailing newline that
+# Jinja drops from the source
+_CARD_SOURCE = """            <div class="dataset-card">
+                <div class="dataset-header">
+                    <div class="dataset-name">{{ card.name|label }}</div>
+                    <div class="dataset-type">{{ card.type }}</div>
+                </div>
+
+                <div class="scores-section">
+                    {% for metric, score, score_class in card.scores %}
+                    <div class="score-item">
+                        <span class="score-label">{{ metric|label }}</span>
+                        <span class="score-value {{ score_class }}">{{ score|fmt3 }}</span>
+                    </div>
+                    {% endfor %}
+                </div>
+                {% if card.errors %}
+
+                <details class="error-section">
+                    <summary class="error-title">Error IDs ({{ card.error_count }}) - click an ID to view details</summary>
+                    <div class="error-list">
+                        {% for error_id, detail in card.errors %}
+                        {% if detail %}
+                        {# tojson output is attribute-safe inside single quotes #}
+                        <div class="error-item" data-q='{{ detail.get("query", "")|tojson }}' data-gt='{{ detail.get("ground_truth", "")|tojson }}' data-pd='{{ detail.get("prediction", "")|tojson }}'>{{ error_id }}
+                            <div class="error-detail" style="display:none;margin-top:6px;background:#fff;border:1px solid #eee;border-radius:6px;padding:8px;">
+                                <div><strong>Query:</strong> <span class="err-q"></span></div>
+                                <div><strong>GT:</strong> <span class="err-gt"></span></div>
+                                <div><strong>Pred:</strong> <span class="err-pd"></span></div>
+                            </div>
+                        </div>
+                        {% else %}
+                        <div class="error-item">{{ error_id }}</div>
+                        {% endif %}
+                        {% endfor %}
+                        {% if card.error_count > 10 %}
+                        <div class="error-item">... and {{ card.error_count - 10 }} more</div>
+                        {% endif %}
+                    </div>
+                </details>
+                {% endif %}
+            </div>
+"""
+
+_REPORT_TEMPLATE = _ENV.from_string(_REPORT_SOURCE)
+_CARD_TEMPLATE = _ENV.from_string(_CARD_SOURCE)
+
+# Size of the SVG viewBox for the per-type charts; the SVG scales to its box
+_CHART_WIDTH = 900
+_CHART_HEIGHT = 420
+
+# Rank of the preferred metrics; every other metric sorts after them
+_METRIC_RANK = {"acc": 0, "f1": 1, "em": 2}
+
+
+def _parse_scores(scores: Optional[Dict[str, Any]]) -> List[Tuple[str, str, float]]:
+    """(name, lower-cased name, value) for every score that parses as a float."""
+    parsed = []
+    for metric, val in (scores or {}).items():
+        if val is None or val == "":
+            continue
+        try:
+            num_val = float(val)
+        except Exception:
+            continue
+        name = str(metric)
+        parsed.append((name, name.lower(), num_val))
+    return parsed
+
+
+# Rendered pages are cached with this marker in place of the timestamp
+_TIMESTAMP_MARKER = "\x00timestamp\x00"
+_CONTENT_CACHE_SIZE = 8
+# Rendered dataset cards kept for reuse across reports
+_CARD_CACHE_SIZE = 256
+
+
+def _context_digest(context: Dict[str, Any]) -> Optional[bytes]:
+    """Digest of a template context, or None if it cannot be serialized."""
+    try:
+        payload = json.dumps(context, sort_keys=True, default=str)
+    except TypeError:
+        # Mixed-type keys cannot be sorted
+        return None
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).digest()
+
+
+class HTMLReporter:
+    """Generate HTML reports for evaluation results."""
+
+    def __init__(self, output_dir: str = "reports"):
+        self.output_dir = output_dir
+        os.makedirs(output_dir, exist_ok=True)
+        # results digest -> page split around the timestamp
+        self._content_cache: Dict[bytes, Tuple[str, str]] = {}
+        # card context digest -> rendered card
+        self._card_cache: Dict[bytes, Markup] = {}
+
+    def generate_report(self, results: Dict[str, Any], filename: str = None) -> str:
         """
+        Generate HTML report from evaluation results.
 
-        return html_template
+        Args:
+            results: Dictionary containing evaluation results for all datasets
+            filename: Optional filename for the report
 
-    def _generate_dataset_card(
-        self, dataset_name: str, dataset_data: Dict[str, Any]
-    ) -> str:
-        """Generate HTML for a single dataset card."""
+        Returns:
+            str: Path to the generated HTML file
+        """
+        if filename is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"evaluation_report_{timestamp}.html"
 
-        # Generate scores HTML
-        scores_html = ""
-        if "scores" in dataset_data:
-            preferred_order = ["acc", "f1", "em"]
-            metrics_to_render = []
-            scores_dict = dataset_data["scores"]
+        filepath = os.path.join(self.output_dir, filename)
 
-            # Build a lookup for case-insensitive match while preserving first-seen original key
-            lower_to_entry = {}
-            for metric, val in scores_dict.items():
-                if val is None or val == "":
-                    continue
-                lower = str(metric).lower()
-                if lower not in lower_to_entry:
-                    try:
-                        num_val = float(val)
-                    except Exception:
-                        continue
-                    lower_to_entry[lower] = (metric, num_val)
-
-            added_lowers = set()
-            # Add preferred metrics first if present
-            for key in preferred_order:
-                if key in lower_to_entry:
-                    orig_key, num_val = lower_to_entry[key]
-                    metrics_to_render.append((orig_key, num_val))
-                    added_lowers.add(key)
-
-            # Add remaining metrics in original order (case-insensitive de-dup)
-            for metric, val in scores_dict.items():
-                lower = str(metric).lower()
-                if lower in added_lowers:
-                    continue
-                if val is None or val == "":
-                    continue
-                try:
-                    num_val = float(val)
-                except Exception:
-                    continue
-                metrics_to_render.append((metric, num_val))
-                added_lowers.add(lower)
-
-            for metric, score in metrics_to_render:
-                score_class = self._get_score_class(score)
-                scores_html += f"""
-                <div class=\"score-item\">\n                    <span class=\"score-label\">{str(metric).upper()}</span>\n                    <span class=\"score-value {score_class}\">{score:.3f}</span>\n                </div>
-                """
-
-        # Generate errors HTML
-        errors_html = ""
-        if "error_id" in dataset_data and dataset_data["error_id"]:
-            error_items = ""
-            # Build rich details lookup if provided
-            details = dataset_data.get("error_details", {}) or {}
-            # Show up to 10 errors
-            for error_id in dataset_data["error_id"][:10]:
-                safe_id = json.dumps(error_id)
-                detail = details.get(error_id)
-                if detail:
-                    q = json.dumps(detail.get("query", ""))
-                    gt = json.dumps(detail.get("ground_truth", ""))
-                    pd = json.dumps(detail.get("prediction", ""))
-                    error_items += (
-                        f'<div class="error-item">'
-                        f"{error_id}"
-                        f'<div class="error-detail" style="display:none;margin-top:6px;background:#fff;border:1px solid #eee;border-radius:6px;padding:8px;">'
-                        f'<div><strong>Query:</strong> <span class="err-q"></span></div>'
-                        f'<div><strong>GT:</strong> <span class="err-gt"></span></div>'
-                        f'<div><strong>Pred:</strong> <span class="err-pd"></span></div>'
-                        f"</div>"
-                        f"<script>(function(){{"
-                        f"var parent = document.currentScript.parentElement; "
-                        f"var wrap = parent.querySelector('.error-detail'); "
-                        f"var q = {q}; var gt = {gt}; var pd = {pd}; "
-                        f"parent.addEventListener('click', function(evt){{ "
-                        f"  if(evt.target.closest('.error-detail')) return; "
-                        f'  wrap.style.display = (wrap.style.display===\'none\' ? "block" : "none"); '
-                        f"  wrap.querySelector('.err-q').textContent = q; "
-                        f"  wrap.querySelector('.err-gt').textContent = gt; "
-                        f"  wrap.querySelector('.err-pd').textContent = pd; "
-                        f"}});"
-                        f"}})();</script>"
-                        f"</div>"
-                    )
-                else:
-                    error_items += f'<div class="error-item">{error_id}</div>'
-
-            if len(dataset_data["error_id"]) > 10:
-                error_items += f'<div class="error-item">... and {len(dataset_data["error_id"]) - 10} more</div>'
-
-            errors_html = f"""
-            <details class="error-section">
-                <summary class="error-title">Error IDs ({len(dataset_data["error_id"])}) - click an ID to view details</summary>
-                <div class="error-list">
-                    {error_items}
-                </div>
-            </details>
-            """
-
-        return f"""
-        <div class="dataset-card">
-            <div class="dataset-header">
-                <div class="dataset-name">{dataset_name.upper()}</div>
-                <div class="dataset-type">{dataset_data.get("class", "Unknown")}</div>
-            </div>
-            
-            <div class="scores-section">
-                {scores_html}
-            </div>
-            
-            {errors_html}
-        </div>
+        # Chunks stream into a 1 MiB buffer, so the page is never held in
+        # memory as one string
+        with open(filepath, "w", encoding="utf-8", buffering=1 << 20) as f:
+            f.writelines(self._iter_html_chunks(results))
+
+        logger.info(f"HTML report generated: {filepath}")
+        return filepath
+
+    def generate_reports(
+        self,
+        results_list: List[Dict[str, Any]],
+        filenames: List[str] = None,
+        max_workers: int = 8,
+    ) -> List[str]:
         """
+        Generate one HTML report per results dictionary.
 
-    def _generate_summary_stats(self, results: Dict[str, Any]) -> str:
-        """Generate summary statistics section."""
+        Pages are rendered in the calling thread (rendering holds the GIL)
+        while a thread pool writes the finished ones, so file I/O overlaps
+        with rendering the next report.
 
-        total_datasets = len(results)
-        total_errors = sum(len(data.get("error_id", [])) for data in results.values())
+        Args:
+            results_list: Evaluation results, one dictionary per report
+            filenames: Optional filenames, one per report
+            max_workers: Number of writer threads
 
-        # Calculate total samples (total number of samples across all datasets)
-        total_samples = 0
-        for data in results.values():
-            # Try to get sample count from different possible fields
-            if "total" in data:
-                total_samples += data["total"]
-            elif "sample_count" in data:
-                total_samples += data["sample_count"]
-            elif "scores" in data and any(data["scores"].values()):
-                # If no explicit count, assume 1 sample per dataset
-                total_samples += 1
+        Returns:
+            List[str]: Paths to the generated HTML files, in input order
+        """
+        if filenames is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filenames = [
+                f"evaluation_report_{timestamp}_{i}.html"
+                for i in range(len(results_list))
+            ]
+        if len(filenames) != len(results_list):
+            raise ValueError("filenames must have one entry per results dictionary")
+
+        filepaths = [os.path.join(self.output_dir, name) for name in filenames]
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self._write_report,
+                    filepath,
+                    self._generate_html_content(results).encode("utf-8"),
+                )
+                for filepath, results in zip(filepaths, results_list)
+            ]
+            for future in futures:
+                future.result()
 
-        # Calculate average accuracy scores across all datasets (only acc, not f1/em)
-        all_acc_scores = []
-        for data in results.values():
-            if "scores" in data:
-                for metric, score in data["scores"].items():
-                    if (
-                        score is not None
-                        and score != ""
-                        and str(metric).lower() == "acc"
-                    ):
-                        all_acc_scores.append(float(score))
+        logger.info(f"{len(filepaths)} HTML reports generated in {self.output_dir}")
+        return filepaths
 
-        avg_acc_score = (
-            sum(all_acc_scores) / len(all_acc_scores) if all_acc_scores else 0
-        )
+    @staticmethod
+    def _write_report(filepath: str, data: bytes) -> None:
+        """Write an encoded page with a single call on a binary file."""
+        with open(filepath, "wb") as f:
+            f.write(data)
 
-        # Calculate average accuracy scores grouped by dataset type (class) - only acc, not f1/em
-        type_to_acc_scores: Dict[str, List[float]] = {}
-        for data in results.values():
-            dataset_type = data.get("class", "Unknown")
-            if "scores" in data:
-                for metric, score in data["scores"].items():
-                    if (
-                        score is not None
-                        and score != ""
-                        and str(metric).lower() == "acc"
-                    ):
-                        type_to_acc_scores.setdefault(dataset_type, []).append(
-                            float(score)
-                        )
-
-        type_avg_items = ""
-        for dataset_type, acc_scores in sorted(
-            type_to_acc_scores.items(), key=lambda x: x[0]
-        ):
-            type_avg = (sum(acc_scores) / len(acc_scores)) if acc_scores else 0
-            type_avg_items += f"""
-                <div class=\"summary-item\">
-                    <h3>{dataset_type}</h3>
-                    <div class=\"value\">{type_avg:.3f}</div>
-                </div>
-            """
+    def _generate_html_content(self, results: Dict[str, Any]) -> str:
+        """Generate the HTML content for the report."""
+        return "".join(self._iter_html_chunks(results))
 
-        type_avg_section = (
-            f"""
-            <div style=\"margin-top: 20px;\">
-                <h2>🧩 Average Accuracy Score by Type (Acc Only)</h2>
-                <div class=\"summary-grid\">
-                    {type_avg_items}
-                </div>
-            </div>
+    def _iter_html_chunks(self, results: Dict[str, Any]) -> Iterator[str]:
+        """Yield the report page piece by piece.
+
+        Pages for identical results are served from a small cache; only the
+        timestamp is filled in again. Other pages are streamed from the
+        template one card at a time.
         """
-            if type_avg_items
-            else ""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        # Scores are parsed once and shared by the summary and the cards
+        parsed_scores = {
+            dataset_name: _parse_scores(dataset_data.get("scores"))
+            for dataset_name, dataset_data in results.items()
+        }
+        # The caches are keyed on what the page renders (at most 10 error
+        # details per card), not on the full results
+        summary = self._summary_context(results, parsed_scores)
+        cards = [
+            self._dataset_card_context(
+                dataset_name, dataset_data, parsed_scores[dataset_name]
+            )
+            for dataset_name, dataset_data in results.items()
+        ]
+        card_keys = [_context_digest(card) for card in cards]
+        key = self._content_cache_key(summary, card_keys)
+        parts = self._content_cache.get(key) if key is not None else None
+        if parts is not None:
+            yield parts[0]
+            yield timestamp
+            yield parts[1]
+            return
+
+        chunks = _REPORT_TEMPLATE.generate(
+            summary=summary,
+            cards=(
+                self._render_card(card, card_key)
+                for card, card_key in zip(cards, card_keys)
+            ),
+            timestamp=_TIMESTAMP_MARKER,
         )
-
-        # Build dataset-level accuracy averages per type for charting (only acc, not f1/em)
-        type_to_dataset_avgs: Dict[str, List[Dict[str, Any]]] = {}
-        for dataset_name, data in results.items():
-            dataset_type = data.get("class", "Unknown")
-            acc_score = None
-            if "scores" in data:
-                for metric, s in data["scores"].items():
-                    if s is not None and s != "" and str(metric).lower() == "acc":
-                        acc_score = float(s)
-                        break
-            if acc_score is not None:
-                type_to_dataset_avgs.setdefault(dataset_type, []).append(
-                    {"name": dataset_name, "score": round(acc_score, 4)}
+        # Pages that will be cached are also kept as they stream out; the
+        # marker arrives as a chunk of its own
+        collected = [] if key is not None else None
+        for chunk in chunks:
+            if collected is not None:
+                collected.append(chunk)
+            yield timestamp if chunk == _TIMESTAMP_MARKER else chunk
+
+        if collected is not None:
+            if len(self._content_cache) >= _CONTENT_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._content_cache[next(iter(self._content_cache))]
+            page = "".join(collected)
+            self._content_cache[key] = tuple(page.split(_TIMESTAMP_MARKER, 1))
+
+    @staticmethod
+    def _content_cache_key(
+        summary: Dict[str, Any], card_keys: List[Optional[bytes]]
+    ) -> Optional[bytes]:
+        """Digest of the page contexts, or None when the page should not be cached."""
+        if None in card_keys:
+            return None
+        summary_key = _context_digest(summary)
+        if summary_key is None:
+            return None
+        return hashlib.blake2b(
+            summary_key + b"".join(card_keys), digest_size=16
+        ).digest()
+
+    def _render_card(self, card: Dict[str, Any], key: Optional[bytes]) -> Markup:
+        """Render one dataset card, reusing the last rendering of the same card.
+
+        The key is the digest of the card's own context, so a re-run of one
+        dataset only re-renders that card.
+        """
+        if key is None:
+            return Markup(_CARD_TEMPLATE.render(card=card))
+
+        html = self._card_cache.get(key)
+        if html is None:
+            if len(self._card_cache) >= _CARD_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._card_cache[next(iter(self._card_cache))]
+            # The template autoescapes, so its output is safe markup
+            html = self._card_cache[key] = Markup(_CARD_TEMPLATE.render(card=card))
+        return html
+
+    def _dataset_card_context(
+        self,
+        dataset_name: str,
+        dataset_data: Dict[str, Any],
+        parsed_scores: List[Tuple[str, str, float]],
+    ) -> Dict[str, Any]:
+        """Collect the values rendered in a single dataset card."""
+
+        # Keep the first entry per case-insensitive name, then one sort puts
+        # acc/f1/em first and the rest in their original order
+        other_rank = len(_METRIC_RANK)
+        first_by_lower = {}
+        for index, (name, lower, num_val) in enumerate(parsed_scores):
+            if lower not in first_by_lower:
+                first_by_lower[lower] = (
+                    _METRIC_RANK.get(lower, other_rank),
+                    index,
+                    name,
+                    num_val,
                 )
 
-        # Compute per-type average based on dataset averages (for chart reference line)
-        type_chart_avgs: Dict[str, float] = {}
-        for t, items in type_to_dataset_avgs.items():
-            if items:
-                type_chart_avgs[t] = round(
-                    sum(i["score"] for i in items) / len(items), 4
-                )
+        # (metric, score, css class) rows
+        scores = []
+        for _, _, name, score in sorted(first_by_lower.values()):
+            score_class = (
+                "high" if score >= 0.8 else "medium" if score >= 0.6 else "low"
+            )
+            scores.append((name, score, score_class))
+        # (error id, details or None) for the first 10 errors
+        errors = []
+        error_ids = dataset_data.get("error_id") or []
+        if error_ids:
+            shown = error_ids[:10]
+            # Build rich details lookup if provided
+            details = dataset_data.get("error_details")
+            if details:
+                errors = [(error_id, details.get(error_id)) for error_id in shown]
             else:
-                type_chart_avgs[t] = 0.0
+                # Common case without details: no lookups, plain id items
+                errors = [(error_id, None) for error_id in shown]
+
+        return {
+            "name": dataset_name,
+            "type": dataset_data.get("class", "Unknown"),
+            "scores": scores,
+            "errors": errors,
+            "error_count": len(error_ids),
+        }
+
+    def _summary_context(
+        self,
+        results: Dict[str, Any],
+        parsed_scores: Dict[str, List[Tuple[str, str, float]]],
+    ) -> Dict[str, Any]:
+        """Collect the values rendered in the summary section."""
+        total_datasets = len(results)
+        total_errors = 0
+        total_samples = 0
+        all_acc_scores = []
+        type_to_acc_scores: Dict[str, List[float]] = defaultdict(list)
+        type_to_dataset_metrics: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
-        # Prepare per-type, per-dataset metric details for grouped bars (acc, f1, em)
-        type_to_dataset_metrics: Dict[str, List[Dict[str, Any]]] = {}
-        type_to_metric_order: Dict[str, List[str]] = {}
-        preferred_metrics = ["acc", "f1", "em"]
+        # One pass over the datasets feeds every aggregate
         for dataset_name, data in results.items():
             dataset_type = data.get("class", "Unknown")
+            scores = data.get("scores", {}) or {}
+            total_errors += len(data.get("error_id", []))
+
+            # Try to get sample count from different possible fields
+            if "total" in data:
+                total_samples += data["total"]
+            elif "sample_count" in data:
+                total_samples += data["sample_count"]
+            elif any(scores.values()):
+                # If no explicit count, assume 1 sample per dataset
+                total_samples += 1
+
+            # Only acc (not f1/em) feeds the overall and per-type averages
             metrics_map: Dict[str, float] = {}
-            for m, v in (data.get("scores", {}) or {}).items():
-                if v is None or v == "":
-                    continue
-                try:
-                    metrics_map[str(m)] = float(v)
-                except Exception:
-                    continue
+            for name, lower, value in parsed_scores[dataset_name]:
+                metrics_map[name] = value
+                if lower == "acc":
+                    all_acc_scores.append(value)
+                    type_to_acc_scores[dataset_type].append(value)
+
+            # Per-type, per-dataset metric details for grouped bars (acc, f1, em)
             if metrics_map:
-                type_to_dataset_metrics.setdefault(dataset_type, []).append(
+                type_to_dataset_metrics[dataset_type].append(
                     {"name": dataset_name, "metrics": metrics_map}
                 )
-        # Metric order per type: preferred first (if present), then remaining alpha
+
+        avg_acc_score = (
+            sum(all_acc_scores) / len(all_acc_scores) if all_acc_scores else 0
+        )
+
+        type_avgs = [
+            (dataset_type, (sum(acc_scores) / len(acc_scores)) if acc_scores else 0)
+            for dataset_type, acc_scores in sorted(
+                type_to_acc_scores.items(), key=lambda x: x[0]
+            )
+        ]
+
+        # Metric order per type: preferred first (if present), then remaining
+        # alphabetically, keeping the case of each name's first occurrence
+        type_to_metric_order: Dict[str, List[str]] = {}
+        other_rank = len(_METRIC_RANK)
         for t, items in type_to_dataset_metrics.items():
-            present_keys = set()
-            for it in items:
-                present_keys.update(k for k in it.get("metrics", {}).keys())
-            ordered = [
-                m
-                for m in preferred_metrics
-                if m in {k.lower(): k for k in present_keys}.keys()
-            ]
-            # Map lower->original to preserve case of first occurrence
             lower_to_orig = {}
             for it in items:
-                for k in it.get("metrics", {}).keys():
-                    lk = k.lower()
-                    if lk not in lower_to_orig:
-                        lower_to_orig[lk] = k
-            # Build ordered list with preserved original keys
-            ordered_preserved = []
-            for m in preferred_metrics:
-                for lk, ok in lower_to_orig.items():
-                    if lk == m and ok not in ordered_preserved:
-                        ordered_preserved.append(ok)
-            remaining = sorted(
-                [ok for lk, ok in lower_to_orig.items() if lk not in preferred_metrics],
-                key=lambda x: x.lower(),
-            )
-            type_to_metric_order[t] = ordered_preserved + remaining
+                for k in it["metrics"]:
+                    lower_to_orig.setdefault(k.lower(), k)
+            type_to_metric_order[t] = [
+                orig
+                for _, _, orig in sorted(
+                    (_METRIC_RANK.get(lk, other_rank), lk, orig)
+                    for lk, orig in lower_to_orig.items()
+                )
+            ]
 
         # Compute per-type per-metric averages (keys stored in lowercase for easy lookup)
         type_metric_avg_map: Dict[str, Dict[str, float]] = {}
         for t, items in type_to_dataset_metrics.items():
-            sums: Dict[str, float] = {}
-            counts: Dict[str, int] = {}
+            sums: Dict[str, float] = defaultdict(float)
+            counts: Dict[str, int] = Counter()
             for it in items:
                 for m, v in (it.get("metrics", {}) or {}).items():
-                    lk = str(m).lower()
-                    sums[lk] = sums.get(lk, 0.0) + float(v)
-                    counts[lk] = counts.get(lk, 0) + 1
+                    lk = m.lower()
+                    sums[lk] += v
+                    counts[lk] += 1
             type_metric_avg_map[t] = {
-                mk: (sums[mk] / counts[mk])
-                for mk in sums.keys()
-                if counts.get(mk, 0) > 0
+                mk: (sums[mk] / counts[mk]) for mk in sums if counts[mk] > 0
             }
 
-        # Prepare chart HTML + inline script
-        if type_to_dataset_avgs:
-            import json as _json
-
-            type_chart_data_json = _json.dumps(type_to_dataset_avgs)
-            type_chart_avg_json = _json.dumps(type_chart_avgs)
-            type_order = list(sorted(type_to_dataset_avgs.keys()))
-            type_order_json = _json.dumps(type_order)
-            chart_metrics_json = _json.dumps(type_to_dataset_metrics)
-            chart_metric_order_json = _json.dumps(type_to_metric_order)
-            type_metric_avg_json = _json.dumps(type_metric_avg_map)
-            type_tabs_html = "".join(
-                [
-                    f'<button class="type-tab" data-type="{t}" style="padding:8px 12px;margin:6px;border:1px solid #667eea;border-radius:16px;background:#fff;color:#667eea;cursor:pointer;">{t}</button>'
-                    for t in type_order
-                ]
+        # One pre-rendered chart pane (and tab) per type with an acc score
+        chart = [
+            self._chart_pane_context(
+                t,
+                type_to_dataset_metrics[t],
+                type_to_metric_order[t],
+                type_metric_avg_map[t],
             )
-            type_chart_section = f"""
-            <div class=\"type-chart-section\" style=\"margin-top: 24px;\">
-                <h2>📈 Scores by Type</h2>
-                <div class=\"type-tabs\" style=\"margin: 10px 0;\">
-                    {type_tabs_html}
-                </div>
-                <div class=\"chart-container\" style=\"width: 100%; background: #fff; border-radius: 10px; padding: 12px; border: 1px solid #eee;\">
-                    <div id=\"type-legend\" class=\"type-legend\" style=\"display:flex;flex-wrap:wrap;gap:10px;margin-bottom:8px;align-items:center;\"></div>
-                    <svg id=\"type-bar-chart\" width=\"100%\" height=\"420\"></svg>
-                </div>
-                <script>
-                (function() {{
-                    const data = {type_chart_data_json};
-                    const typeAverages = {type_chart_avg_json};
-                    const typeOrder = {type_order_json};
-                    const chartMetrics = {chart_metrics_json};
-                    const typeMetricOrder = {chart_metric_order_json};
-                    const typeMetricAverages = {type_metric_avg_json};
-                    const container = document.querySelector('.type-chart-section');
-                    const svg = container.querySelector('#type-bar-chart');
-                    const tabs = container.querySelectorAll('.type-tab');
-                    const legendDiv = container.querySelector('#type-legend');
-
-                    function setActiveTab(activeType) {{
-                        tabs.forEach(btn => {{
-                            if (btn.dataset.type === activeType) {{
-                                btn.style.background = '#667eea';
-                                btn.style.color = '#fff';
-                            }} else {{
-                                btn.style.background = '#fff';
-                                btn.style.color = '#667eea';
-                            }}
-                        }});
-                    }}
-
-                    function renderLegend() {{
-                        if (!legendDiv) return;
-                        legendDiv.innerHTML = '';
-                        const defs = [
-                            {{ color: '#28a745', label: '>= AVG' }},
-                            {{ color: '#dc3545', label: '< AVG' }},
-                        ];
-                        defs.forEach(def => {{
-                            const item = document.createElement('div');
-                            item.style.display = 'flex';
-                            item.style.alignItems = 'center';
-                            item.style.gap = '6px';
-                            const sw = document.createElement('span');
-                            sw.style.display = 'inline-block';
-                            sw.style.width = '12px';
-                            sw.style.height = '12px';
-                            sw.style.background = def.color;
-                            sw.style.borderRadius = '2px';
-                            const label = document.createElement('span');
-                            label.style.fontSize = '12px';
-                            label.style.color = '#495057';
-                            label.textContent = def.label;
-                            item.appendChild(sw);
-                            item.appendChild(label);
-                            legendDiv.appendChild(item);
-                        }});
-                    }}
-
-                    function renderTypeChart(typeKey) {{
-                        const items = (chartMetrics[typeKey] || []).slice();
-                        const allOrder = typeMetricOrder[typeKey] || [];
-                        const pref = ['acc','f1','em'];
-                        // Metrics on X-axis
-                        const metricsAxis = pref.map(k => (allOrder.find(m => String(m).toLowerCase() === k))).filter(Boolean);
-                        const finalMetrics = metricsAxis.length ? metricsAxis : allOrder;
-                        const datasets = items.map(d => d.name);
-
-                        const W = svg.clientWidth || svg.getBoundingClientRect().width || 900;
-                        const left = 60, right = 20, top = 20, bottom = 110;
-                        const H = 420;
-                        svg.setAttribute('height', H);
-                        const innerW = Math.max(200, W - left - right);
-                        const innerH = Math.max(100, H - top - bottom);
-
-                        // Clear
-                        while (svg.firstChild) svg.removeChild(svg.firstChild);
-
-                        // Y grid lines 0, 0.5, 1.0
-                        [0, 0.5, 1].forEach(tick => {{
-                            const y = top + innerH * (1 - tick);
-                            const line = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-                            line.setAttribute('x1', left);
-                            line.setAttribute('y1', y);
-                            line.setAttribute('x2', left + innerW);
-                            line.setAttribute('y2', y);
-                            line.setAttribute('stroke', '#e9ecef');
-                            line.setAttribute('stroke-width', '1');
-                            svg.appendChild(line);
-                            const lbl = document.createElementNS('http://www.w3.org/2000/svg', 'text');
-                            lbl.setAttribute('x', left - 8);
-                            lbl.setAttribute('y', y + 4);
-                            lbl.setAttribute('text-anchor', 'end');
-                            lbl.setAttribute('font-size', '11');
-                            lbl.setAttribute('fill', '#6c757d');
-                            lbl.textContent = String(tick.toFixed(1));
-                            svg.appendChild(lbl);
-                        }});
-
-                        // Compute layout per metric group
-                        const groupCount = Math.max(1, finalMetrics.length);
-                        const groupPad = 24;
-                        const groupW = Math.max(40, (innerW - groupPad * (groupCount - 1)) / groupCount);
-                        const numDatasets = Math.max(1, datasets.length);
-                        const innerGap = 4;
-                        const barW = Math.max(6, (groupW - innerGap * (numDatasets - 1)) / numDatasets);
-
-                        // Legend: threshold meaning
-                        renderLegend();
-
-                        // Draw bars
-                        finalMetrics.forEach((metric, gi) => {{
-                            const groupX = left + gi * (groupW + groupPad);
-                            const avgMap = typeMetricAverages[typeKey] || {{}};
-                            const metricAvg = avgMap[String(metric).toLowerCase()] || 0;
-
-                            // Metric label under group
-                            const mLbl = document.createElementNS('http://www.w3.org/2000/svg', 'text');
-                            mLbl.setAttribute('x', groupX + groupW / 2);
-                            mLbl.setAttribute('y', top + innerH + 20);
-                            mLbl.setAttribute('text-anchor', 'middle');
-                            mLbl.setAttribute('font-size', '12');
-                            mLbl.setAttribute('fill', '#495057');
-                            mLbl.textContent = String(metric).toUpperCase();
-                            svg.appendChild(mLbl);
-
-                            // Average line for this metric
-                            const yAvg = top + innerH * (1 - Math.max(0, Math.min(1, metricAvg)));
-                            const mLine = document.createElementNS('http://www.w3.org/2000/svg', 'line');
-                            mLine.setAttribute('x1', groupX);
-                            mLine.setAttribute('y1', yAvg);
-                            mLine.setAttribute('x2', groupX + groupW);
-                            mLine.setAttribute('y2', yAvg);
-                            mLine.setAttribute('stroke', '#6c757d');
-                            mLine.setAttribute('stroke-dasharray', '4,3');
-                            mLine.setAttribute('stroke-width', '1.5');
-                            svg.appendChild(mLine);
-
-                            // Bars per dataset
-                            datasets.forEach((ds, j) => {{
-                                const item = items[j];
-                                const val = (item && item.metrics && Object.prototype.hasOwnProperty.call(item.metrics, metric)) ? item.metrics[metric] : null;
-                                if (val == null) return;
-                                const v = Math.max(0, Math.min(1, val));
-                                const x = groupX + j * (barW + innerGap);
-                                const y = top + innerH * (1 - v);
-                                const h = innerH * v;
-                                const color = v >= metricAvg ? '#28a745' : '#dc3545';
-                                const rect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-                                rect.setAttribute('x', x);
-                                rect.setAttribute('y', y);
-                                rect.setAttribute('width', barW);
-                                rect.setAttribute('height', Math.max(1, h));
-                                rect.setAttribute('fill', color);
-                                rect.setAttribute('opacity', '0.9');
-                                svg.appendChild(rect);
-
-                                // Dataset label (rotated) under x-axis, once per group for clarity
-                                const lbl = document.createElementNS('http://www.w3.org/2000/svg', 'text');
-                                const lx = x + barW / 2;
-                                const ly = top + innerH + 36;
-                                lbl.setAttribute('x', lx);
-                                lbl.setAttribute('y', ly);
-                                lbl.setAttribute('text-anchor', 'end');
-                                lbl.setAttribute('font-size', '15');
-                                lbl.setAttribute('fill', '#6c757d');
-                                lbl.textContent = ds;
-                                lbl.setAttribute('transform', 'rotate(-45 ' + lx + ' ' + ly + ')');
-                                svg.appendChild(lbl);
-                            }});
-                        }});
-                    }}
-                 
-                    // Bind events
-                    tabs.forEach(btn => {{
-                        btn.addEventListener('click', () => {{
-                            const t = btn.dataset.type;
-                            setActiveTab(t);
-                            renderTypeChart(t);
-                        }});
-                    }});
-                 
-                    // Initial render
-                    if (typeOrder && typeOrder.length) {{
-                        setActiveTab(typeOrder[0]);
-                        renderTypeChart(typeOrder[0]);
-                    }}
-                }})();
-                </script>
-            </div>
-            """
-        else:
-            type_chart_section = ""
-
-        return f"""
-        <div class=\"summary-section\">\n            <h2>📊 Summary Statistics</h2>\n            <div class=\"summary-grid\">\n                <div class=\"summary-item\">\n                    <h3>Total Datasets</h3>\n                    <div class=\"value\">{total_datasets}</div>\n                </div>\n                <div class=\"summary-item\">\n                    <h3>Total Samples</h3>\n                    <div class=\"value\">{total_samples}</div>\n                </div>\n                <div class=\"summary-item\">\n                    <h3>Total Errors</h3>\n                    <div class=\"value\">{total_errors}</div>\n                </div>\n                <div class=\"summary-item\">\n                    <h3>Average Accuracy Score (Acc Only)</h3>\n                    <div class=\"value\">{avg_acc_score:.3f}</div>\n                </div>\n            </div>\n            {type_avg_section}\n            {type_chart_section}\n        </div>\n        """
-
-    def _get_score_class(self, score: float) -> str:
-        """Get CSS class for score styling."""
-        if score >= 0.8:
-            return "high"
-        elif score >= 0.6:
-            return "medium"
-        else:
-            return "low"
+            for t in sorted(type_to_acc_scores)
+        ]
+
+        return {
+            "total_datasets": total_datasets,
+            "total_samples": total_samples,
+            "total_errors": total_errors,
+            "avg_acc_score": avg_acc_score,
+            "type_avgs": type_avgs,
+            "chart": chart,
+        }
+
+    def _chart_pane_context(
+        self,
+        type_key: str,
+        items: List[Dict[str, Any]],
+        metric_order: List[str],
+        metric_averages: Dict[str, float],
+    ) -> Dict[str, Any]:
+        """Lay out the grouped bar chart of one dataset type as SVG geometry.
+
+        Groups are metrics (acc/f1/em when present, otherwise every metric),
+        with one bar per dataset coloured against the type's metric average.
+        """
+        pref_axis = [
+            next((m for m in metric_order if m.lower() == k), None)
+            for k in ("acc", "f1", "em")
+        ]
+        metrics_axis = [m for m in pref_axis if m] or metric_order
+
+        width, height = _CHART_WIDTH, _CHART_HEIGHT
+        left, right, top, bottom = 60, 20, 20, 110
+        inner_w = max(200, width - left - right)
+        inner_h = max(100, height - top - bottom)
+
+        def clamp(v: float) -> float:
+            return max(0.0, min(1.0, v))
+
+        # Y grid lines 0, 0.5, 1.0
+        grid = [
+            (round(top + inner_h * (1 - tick), 2), f"{tick:.1f}")
+            for tick in (0, 0.5, 1)
+        ]
+
+        group_count = max(1, len(metrics_axis))
+        group_pad = 24
+        group_w = max(40, (inner_w - group_pad * (group_count - 1)) / group_count)
+        num_datasets = max(1, len(items))
+        inner_gap = 4
+        bar_w = max(6, (group_w - inner_gap * (num_datasets - 1)) / num_datasets)
+        bar_w_r = round(bar_w, 2)
+
+        # Bar outlines as path commands, by colour
+        above_avg: List[str] = []
+        below_avg: List[str] = []
+        groups = []
+        for gi, metric in enumerate(metrics_axis):
+            group_x = left + gi * (group_w + group_pad)
+            metric_avg = metric_averages.get(metric.lower()) or 0
+            bars = []
+            for j, item in enumerate(items):
+                val = item["metrics"].get(metric)
+                if val is None:
+                    continue
+                v = clamp(val)
+                x = group_x + j * (bar_w + inner_gap)
+                y = round(top + inner_h * (1 - v), 2)
+                bar_h = round(max(1, inner_h * v), 2)
+                (above_avg if v >= metric_avg else below_avg).append(
+                    f"M{round(x, 2)} {y}h{bar_w_r}v{bar_h}h-{bar_w_r}z"
+                )
+                bars.append(
+                    {"label_x": round(x + bar_w / 2, 2), "dataset": item["name"]}
+                )
+            groups.append(
+                {
+                    "metric": metric,
+                    "label_x": round(group_x + group_w / 2, 2),
+                    "x1": round(group_x, 2),
+                    "x2": round(group_x + group_w, 2),
+                    "avg_y": round(top + inner_h * (1 - clamp(metric_avg)), 2),
+                    "bars": bars,
+                }
+            )
+
+        return {
+            "type": type_key,
+            "width": width,
+            "height": height,
+            "left": left,
+            "right": left + inner_w,
+            "grid": grid,
+            "metric_label_y": top + inner_h + 20,
+            "dataset_label_y": top + inner_h + 36,
+            "groups": groups,
+            "bar_paths": [
+                (color, "".join(parts))
+                for color, parts in (("#28a745", above_avg), ("#dc3545", below_avg))
+                if parts
+            ],
+        }
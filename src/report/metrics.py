@@ -2,12 +2,117 @@
 Evaluation metrics for different types of questions.
 """
 
+import functools
 import re
-from typing import List, Tuple
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import List, Optional, Tuple
 
 from ..data import EvalResult
 
-blank_ct = 0
+# pyahocorasick is optional; it matches long alias lists in a single scan
+try:
+    import ahocorasick
+
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# google-re2 is optional; its linear-time engine runs the emphasis
+# substitution, which sees every prediction
+try:
+    import re2
+
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Compiled once; both patterns run for every answer-prediction pair. The
+# emphasis pattern matches what r"\*(.*?)\*" did, without the lazy
+# quantifier. _WORD_RE stays on re: re2's \w is ASCII-only
+_STAR_RE = (re2 if RE2_AVAILABLE else re).compile(r"\*([^*\n]*)\*")
+_WORD_RE = re.compile(r"\w+")
+
+# For ASCII text, \w is [A-Za-z0-9_]: mapping every other character to a
+# space and splitting yields the same words as _WORD_RE.findall
+_ASCII_NON_WORD = str.maketrans(
+    {c: " " for c in map(chr, range(128)) if not (c.isalnum() or c == "_")}
+)
+
+# Both fields in one C-level call per result in the metric loops
+_answer_and_prediction = attrgetter("answer", "prediction")
+
+# Alias lists shorter than this are not worth building an automaton for
+_AUTOMATON_MIN_ALIASES = 4
+
+# Optional replacement for calculate_f1, set by activate_numba_scorer()
+_f1_scorer = None
+
+
+def activate_numba_scorer():
+    """Route calculate_f1 through the numba kernel in numba_metrics."""
+    global _f1_scorer
+    from .numba_metrics import NUMBA_AVAILABLE, calculate_f1_numba
+
+    if not NUMBA_AVAILABLE:
+        raise ImportError(
+            "numba is not installed. Please install it with: pip install numba"
+        )
+    _f1_scorer = calculate_f1_numba
+
+
+@dataclass(slots=True)
+class NormalizedResult:
+    """Lower-cased, stripped strings shared by the F1 and exact-match metrics.
+
+    Empty inputs are kept as None so they are still rejected before
+    stripping, as in the per-pair helpers.
+    """
+
+    answers: Tuple[Optional[str], ...]
+    prediction: Optional[str]
+    # Text scored by F1: the part after "</think>" for list answers that
+    # have one, otherwise the whole prediction
+    f1_prediction: Optional[str]
+
+
+def _think_answer(text: str) -> Optional[str]:
+    """Text after the first "</think>" (up to any later one), or None.
+
+    Same piece as ``text.split("</think>")[1]``, without scanning for the
+    tag twice or building the full list of pieces.
+    """
+    _, sep, tail = text.partition("</think>")
+    return tail.partition("</think>")[0] if sep else None
+
+
+def _word_set(text: str) -> set:
+    """Set of the words (``\\w+`` runs) in `text`."""
+    if text.isascii():
+        return set(text.translate(_ASCII_NON_WORD).split())
+    return set(_WORD_RE.findall(text))
+
+
+def _normalize(text: Optional[str]) -> Optional[str]:
+    return text.lower().strip() if text else None
+
+
+def normalize_results(results: List[EvalResult]) -> List[NormalizedResult]:
+    """Normalize every answer and prediction once, for `calculate_f1` and
+    `calculate_exact_match` to share."""
+    normalized = []
+    for answer, prediction in map(_answer_and_prediction, results):
+        pred_norm = _normalize(prediction)
+        if isinstance(answer, list):
+            answers = tuple(map(_normalize, answer))
+            answer_part = _think_answer(prediction) if prediction else None
+            f1_pred = pred_norm if answer_part is None else _normalize(answer_part)
+        else:
+            answers = (_normalize(answer),)
+            f1_pred = pred_norm
+        normalized.append(NormalizedResult(answers, pred_norm, f1_pred))
+    return normalized
+
 
 def calculate_accuracy(results: List[EvalResult]) -> float:
     """
@@ -22,73 +127,94 @@ def calculate_accuracy(results: List[EvalResult]) -> float:
     if not results:
         return 0.0
 
+    is_any_correct, is_correct = _is_any_answer_correct, _is_answer_correct
     correct_count = 0
-    for result in results:
-        if isinstance(result.answer, list):
-            if any(_is_answer_correct(ans, result.prediction) for ans in result.answer):
+    for answer, prediction in map(_answer_and_prediction, results):
+        if isinstance(answer, list):
+            if is_any_correct(answer, prediction):
                 correct_count += 1
         else:
-            if _is_answer_correct(result.answer, result.prediction):
+            if is_correct(answer, prediction):
                 correct_count += 1
 
     return correct_count / len(results)
 
 
-def calculate_f1(results: List[EvalResult]) -> float:
+def calculate_f1(
+    results: List[EvalResult], normalized: Optional[List[NormalizedResult]] = None
+) -> float:
     """
     Calculate F1 score.
 
     Args:
         results: List of EvalResult objects
+        normalized: `normalize_results(results)`, if already computed
 
     Returns:
         float: F1 score between 0 and 1
     """
     if not results:
         return 0.0
+    if _f1_scorer is not None:
+        return _f1_scorer(results)
+
+    if normalized is None:
+        normalized = normalize_results(results)
 
     total_f1 = 0.0
-    for result in results:
-        if isinstance(result.answer, list):
-            temp_f1 = 0.0
-            for ans in result.answer:
-                if "</think>" in result.prediction:
-                    pred_clean = result.prediction.split("</think>")[1]
-                    temp_f1 = max(temp_f1, _calculate_single_f1(ans, pred_clean))
-                else:
-                    pred_clean = result.prediction
-            total_f1 += temp_f1
-        else:
-            total_f1 += _calculate_single_f1(result.answer, result.prediction)
+    for norm in normalized:
+        pred = norm.f1_prediction
+        if pred is None:
+            continue
+        # Best score over the accepted answers; the prediction's words are
+        # only split once
+        pred_words = None
+        temp_f1 = 0.0
+        for gt in norm.answers:
+            if gt is None:
+                continue
+            if gt == pred:
+                temp_f1 = 1.0
+                break
+            if pred_words is None:
+                pred_words = _word_set(pred)
+            temp_f1 = max(temp_f1, _words_f1(_word_set(gt), pred_words))
+        total_f1 += temp_f1
 
     return total_f1 / len(results)
 
 
-def calculate_exact_match(results: List[EvalResult]) -> float:
+def calculate_exact_match(
+    results: List[EvalResult], normalized: Optional[List[NormalizedResult]] = None
+) -> float:
     """
     Calculate exact match score.
 
     Args:
         results: List of EvalResult objects
+        normalized: `normalize_results(results)`, if already computed
 
     Returns:
         float: Exact match score between 0 and 1
     """
     if not results:
         return 0.0
+    if normalized is None:
+        normalized = normalize_results(results)
 
     exact_matches = 0
-    for result in results:
-        if isinstance(result.answer, list):
-            if any(_is_exact_match(ans, result.prediction) for ans in result.answer):
-                exact_matches += 1
-        else:
-            if _is_exact_match(result.answer, result.prediction):
-                exact_matches += 1
+    for norm in normalized:
+        pred = norm.prediction
+        if pred is not None and pred in norm.answers:
+            exact_matches += 1
 
     return exact_matches / len(results)
 
 
+# Predictions are often compared against the same answer more than once (on
+# add, in the metrics and across aliases), so verdicts are memoized. Callers
+# expand lists of accepted answers, so the key is always a pair of strings.
+@functools.lru_cache(maxsize=1 << 16)
 def _is_answer_correct(ground_truth: str, prediction: str) -> bool:
     """
     Check if the prediction is correct using regex pattern matching.
@@ -100,29 +226,19 @@ def _is_answer_correct(ground_truth: str, prediction: str) -> bool:
     Returns:
         bool: True if prediction is correct, False otherwise
     """
-    # if "4,000" in ground_truth:
-    #     breakpoint()
-    global blank_ct
     if not ground_truth or not prediction:
         return False
 
     # Clean and normalize answers
     gt_clean = ground_truth.lower().strip()
-    pred_clean = prediction.lower().strip().replace("**", "")
-    pred_clean = re.sub("\*(.*?)\*", r"\1", pred_clean)
-
-    if "</think>" in pred_clean:
-        pred_clean = pred_clean.split("</think>")[1]
-    
-    else:
-        if "<think>" in pred_clean:
-            return False
+    pred_clean = _clean_prediction(prediction)
+    if pred_clean is None:
+        return False
     # Check exact match first
     if gt_clean == pred_clean:
         return True
 
-    if gt_clean.strip()=="":
-        breakpoint()
+    if not gt_clean:
         return False
     # Use regex pattern matching for partial matches
     # Escape special characters in ground truth
@@ -135,6 +251,64 @@ def _is_answer_correct(ground_truth: str, prediction: str) -> bool:
     return gt_clean in pred_clean
 
 
+def _clean_prediction(prediction: str) -> Optional[str]:
+    """Normalize a prediction for answer matching; None if reasoning is unfinished."""
+    pred_clean = prediction.lower().strip().replace("**", "")
+    pred_clean = _STAR_RE.sub(r"\1", pred_clean)
+
+    answer_part = _think_answer(pred_clean)
+    if answer_part is not None:
+        return answer_part
+    if "<think>" in pred_clean:
+        return None
+    return pred_clean
+
+
+def _is_any_answer_correct(answers: List[str], prediction: str) -> bool:
+    """
+    Check a prediction against a list of accepted answers.
+
+    The prediction is cleaned once for all aliases. Long alias lists are
+    matched with one Aho-Corasick scan when pyahocorasick is installed.
+
+    Args:
+        answers: Accepted ground truth answers
+        prediction: Model prediction
+
+    Returns:
+        bool: True if any answer is found in the prediction, False otherwise
+    """
+    if not prediction:
+        return False
+    pred_clean = _clean_prediction(prediction)
+    if pred_clean is None:
+        return False
+    if not pred_clean:
+        # Only an answer that is blank after stripping equals an empty prediction
+        return any(ans and not ans.strip() for ans in answers)
+
+    if AHOCORASICK_AVAILABLE and len(answers) >= _AUTOMATON_MIN_ALIASES:
+        automaton = ahocorasick.Automaton()
+        for ans in answers:
+            gt_clean = ans.lower().strip() if ans else ""
+            if gt_clean:
+                automaton.add_word(gt_clean, gt_clean)
+        if not len(automaton):
+            return False
+        automaton.make_automaton()
+        # An exact match is also a substring match, so any hit is enough
+        return next(automaton.iter(pred_clean), None) is not None
+
+    # Plain loop: some questions carry dozens of aliases, and a generator
+    # inside any() costs a frame resume per alias
+    for ans in answers:
+        if ans:
+            gt_clean = ans.lower().strip()
+            if gt_clean and gt_clean in pred_clean:
+                return True
+    return False
+
+
 def _is_exact_match(ground_truth: str, prediction: str) -> bool:
     """
     Check if the prediction exactly matches the ground truth.
@@ -171,17 +345,22 @@ def _calculate_single_f1(ground_truth: str, prediction: str) -> float:
         return 1.0
 
     # Word-based F1 calculation
-    gt_words = set(re.findall(r"\w+", ground_truth.lower()))
-    pred_words = set(re.findall(r"\w+", prediction.lower()))
+    gt_words = _word_set(ground_truth.lower())
+    pred_words = _word_set(prediction.lower())
+    return _words_f1(gt_words, pred_words)
+
 
+def _words_f1(gt_words: set, pred_words: set) -> float:
+    """F1 between the word sets of an answer and a prediction."""
     if not gt_words or not pred_words:
         return 0.0
 
-    intersection = gt_words.intersection(pred_words)
-    precision = len(intersection) / len(pred_words) if pred_words else 0
-    recall = len(intersection) / len(gt_words) if gt_words else 0
-
-    if precision + recall == 0:
+    # Only the overlap size is needed; the C intersection already iterates
+    # the smaller set, and disjoint sets exit before the division
+    common = len(gt_words & pred_words)
+    if not common:
         return 0.0
+    precision = common / len(pred_words)
+    recall = common / len(gt_words)
 
     return 2 * (precision * recall) / (precision + recall)
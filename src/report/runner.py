@@ -2,41 +2,123 @@
 Unified execution entry point for RAGQA evaluation.
 """
 
-import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from ..data import EvalResult
+from ..data import EvalResult, _json_dumps_indented
 from ..logger import get_logger
 from .eval_functions import NAME_TO_EVAL_CLASS, evaluate_dataset, get_eval_class
-from .html_reporter import HTMLReporter
 
 logger = get_logger()
 
+# Fields shown for each incorrect answer in the report, fetched in one call
+_error_fields = attrgetter("id", "query", "answer", "prediction")
+
+
+def _eval_worker(
+    dataset_name: str,
+    results: List[EvalResult],
+    eval_methods: Optional[List[str]] = None,
+    use_numba: bool = False,
+) -> Dict[str, Any]:
+    """Evaluate one dataset and summarize it for the report.
+
+    Module-level so it can be sent to worker processes; `use_numba` carries
+    the scorer choice, which a spawned process would not inherit.
+    """
+    if use_numba:
+        from .metrics import activate_numba_scorer
+
+        activate_numba_scorer()
+
+    eval_result = evaluate_dataset(
+        dataset_name,
+        results,
+        output_path=None,  # Don't save individual files
+        eval_methods=eval_methods,
+    )
+
+    return {
+        "name": dataset_name,
+        "class": eval_result.eval_type,
+        "scores": eval_result.scores,
+        "error_id": eval_result.get_error_ids(),
+        # Include rich error details for interactive report
+        "error_details": {
+            id_: {"query": query, "ground_truth": answer, "prediction": prediction}
+            for id_, query, answer, prediction in map(
+                _error_fields, eval_result.get_incorrect_answers()
+            )
+        },
+        "sample_count": len(results),
+    }
+
+
+def _process_eval_worker(
+    dataset_name: str,
+    results: List[EvalResult],
+    eval_methods: Optional[List[str]] = None,
+    use_numba: bool = False,
+):
+    """`_eval_worker` for a worker process, also returning the labels it set.
+
+    The worker labels its own copy of `results`; the labels are sent back so
+    the caller's results end up labelled as with in-process evaluation.
+    """
+    summary = _eval_worker(dataset_name, results, eval_methods, use_numba)
+    return summary, [result.label for result in results]
+
 
 class Runner:
     """Main runner class for RAGQA evaluation."""
 
     def __init__(self, output_dir: str = "reports"):
         self.output_dir = output_dir
-        self.html_reporter = HTMLReporter(output_dir)
+        self._html_reporter = None
         self.results = {}
 
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
 
+    @property
+    def html_reporter(self):
+        """HTML reporter for `output_dir`, imported and created on first use."""
+        if self._html_reporter is None:
+            from .html_reporter import HTMLReporter
+
+            self._html_reporter = HTMLReporter(self.output_dir)
+        return self._html_reporter
+
+    def activate_numba_scorer(self):
+        """Compute F1 with the numba kernel (requires ``pip install numba``)."""
+        from .metrics import activate_numba_scorer
+
+        activate_numba_scorer()
+        logger.info("⚡ Numba F1 scorer activated")
+
     def run_all(
         self,
         results_data: Dict[str, List[EvalResult]],
         eval_methods: Optional[Dict[str, List[str]]] = None,
+        max_workers: Optional[int] = None,
     ) -> Dict[str, Any]:
         """
         Run evaluation for all datasets.
 
+        Datasets are evaluated in this process unless `max_workers` asks for
+        a process pool; results are stored in the order of `results_data`.
+
         Args:
             results_data: Dictionary mapping dataset names to EvalResult lists
             eval_methods: Optional dictionary mapping dataset names to evaluation methods
+            max_workers: Number of worker processes to evaluate datasets in
+                (default: evaluate in this process). A pool is only worth it
+                for large result sets, and should not be forked from a
+                process holding a live GPU engine
 
         Returns:
             Dict containing evaluation results for all datasets
@@ -46,16 +128,44 @@ class Runner:
         if eval_methods is None:
             eval_methods = {}
 
+        dataset_names = []
         for dataset_name in results_data.keys():
+            # Interned: the name keys several dict lookups per dataset
+            dataset_name = sys.intern(dataset_name)
             if dataset_name in NAME_TO_EVAL_CLASS:
                 logger.info(f"📊 Evaluating {dataset_name}...")
+                dataset_names.append(dataset_name)
+            else:
+                logger.warning(f"⚠️  Unknown dataset: {dataset_name}")
+
+        workers = min(len(dataset_names), max_workers or 1)
+        if workers <= 1:
+            for dataset_name in dataset_names:
                 self._evaluate_single_dataset(
                     dataset_name,
                     results_data[dataset_name],
                     eval_methods.get(dataset_name),
                 )
-            else:
-                logger.warning(f"⚠️  Unknown dataset: {dataset_name}")
+        else:
+            from .metrics import _f1_scorer
+
+            use_numba = _f1_scorer is not None
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(
+                        _process_eval_worker,
+                        dataset_name,
+                        results_data[dataset_name],
+                        eval_methods.get(dataset_name),
+                        use_numba,
+                    )
+                    for dataset_name in dataset_names
+                ]
+                for dataset_name, future in zip(dataset_names, futures):
+                    summary, labels = future.result()
+                    for result, label in zip(results_data[dataset_name], labels):
+                        result.set_label(label)
+                    self.results[dataset_name] = summary
 
         logger.info("✅ All datasets evaluated successfully!")
         return self.results
@@ -94,32 +204,7 @@ class Runner:
         eval_methods: Optional[List[str]] = None,
     ):
         """Evaluate a single dataset and store results."""
-
-        # Evaluate the dataset
-        eval_result = evaluate_dataset(
-            dataset_name,
-            results,
-            output_path=None,  # Don't save individual files
-            eval_methods=eval_methods,
-        )
-
-        # Save results to our results dictionary
-        self.results[dataset_name] = {
-            "name": dataset_name,
-            "class": eval_result.eval_type,
-            "scores": eval_result.scores,
-            "error_id": eval_result.get_error_ids(),
-            # Include rich error details for interactive report
-            "error_details": {
-                er.id: {
-                    "query": er.query,
-                    "ground_truth": er.answer,
-                    "prediction": er.prediction,
-                }
-                for er in eval_result.get_incorrect_answers()
-            },
-            "sample_count": len(results),
-        }
+        self.results[dataset_name] = _eval_worker(dataset_name, results, eval_methods)
 
     def generate_html_report(self, filename: str = None) -> str:
         """
@@ -158,8 +243,9 @@ class Runner:
 
         filepath = os.path.join(self.output_dir, filename)
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False)
+        # orjson (when installed) serializes straight to UTF-8 bytes
+        with open(filepath, "wb") as f:
+            f.write(_json_dumps_indented(self.results))
 
         logger.info(f"💾 JSON results saved: {filepath}")
         return filepath
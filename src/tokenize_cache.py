@@ -0,0 +1,98 @@
+"""
+On-disk cache for tokenized prompts.
+
+Local vLLM backends render chat templates to text and tokenize them before
+generation. Token ids are stored in a SQLite table keyed by the tokenizer
+identity and the rendered prompt, so re-running the same dataset (or another
+model sharing the tokenizer) skips tokenization.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import List
+
+from .inference_cache import DEFAULT_CACHE_DIR
+from .logger import get_logger
+
+logger = get_logger()
+
+__all__ = ["TokenizeCache", "tokenize_cached"]
+
+# SQLite limits the number of bound parameters per statement
+_SQLITE_CHUNK = 500
+
+
+class TokenizeCache:
+    """SQLite-backed cache mapping (tokenizer, prompt text) to token ids."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, "tokens.sqlite")
+        # vLLM wrappers may be driven from worker threads
+        self.conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS tokens (key TEXT PRIMARY KEY, ids TEXT)"
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def tokenizer_id(tokenizer) -> str:
+        """Identify a tokenizer by its source path and vocabulary size."""
+        return f"{getattr(tokenizer, 'name_or_path', '')}:{len(tokenizer)}"
+
+    @staticmethod
+    def make_key(tokenizer_id: str, prompt: str) -> str:
+        """Build the cache key for a single rendered prompt."""
+        return hashlib.sha1(f"{tokenizer_id}\0{prompt}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> dict:
+        """Return the cached token ids for the keys that are present."""
+        hits = {}
+        for i in range(0, len(keys), _SQLITE_CHUNK):
+            chunk = keys[i : i + _SQLITE_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self.conn.execute(
+                f"SELECT key, ids FROM tokens WHERE key IN ({placeholders})", chunk
+            )
+            hits.update((key, json.loads(ids)) for key, ids in rows)
+        return hits
+
+    def set_many(self, items: dict) -> None:
+        """Store token ids for the given keys."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO tokens (key, ids) VALUES (?, ?)",
+            [(key, json.dumps(ids)) for key, ids in items.items()],
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def tokenize_cached(
+    tokenizer, prompts: List[str], cache: TokenizeCache
+) -> List[List[int]]:
+    """Tokenize rendered prompts, reusing ids from `cache` where possible.
+
+    Encoding matches what vLLM does for text prompts (`tokenizer.encode`), so
+    generation is unchanged whether or not the cache is used.
+    """
+    tokenizer_id = TokenizeCache.tokenizer_id(tokenizer)
+    keys = [TokenizeCache.make_key(tokenizer_id, p) for p in prompts]
+    hits = cache.get_many(keys)
+    miss_idx = [i for i, k in enumerate(keys) if k not in hits]
+    logger.info(
+        f"Tokenize cache: {len(prompts) - len(miss_idx)} hits, {len(miss_idx)} misses"
+    )
+
+    token_ids = [hits.get(k) for k in keys]
+    if miss_idx:
+        new_items = {}
+        for i in miss_idx:
+            ids = tokenizer.encode(prompts[i])
+            token_ids[i] = ids
+            new_items[keys[i]] = ids
+        cache.set_many(new_items)
+    return token_ids
@@ -2,16 +2,77 @@
 Pytest configuration file for the RAGQA-Leaderboard project
 """
 
+import json
 import os
-import sys
-from pathlib import Path
 
 import pytest
 
-# Add the src directory to Python path
-src_path = str(Path(__file__).parent.parent / "src")
-if src_path not in sys.path:
-    sys.path.insert(0, src_path)
+# Test files are written with orjson when installed, like src/data.py
+try:
+    import orjson
+
+    json_dumps = orjson.dumps
+except ImportError:
+
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+from src.data_preprocess import DataPreprocess
+
+# Documents are served by their own text instead of data/documents_pool.json
+DOC_POOL = {
+    "Paris is the capital of France.": "Paris is the capital of France.",
+    "France is a country in Europe.": "France is a country in Europe.",
+}
+
+# Prompt configs the DataPreprocess tests run against
+PROMPT_CONFIGS = [
+    {
+        "system_prompt": "You are a helpful assistant.",
+        "user_prompt": "Based on the following documents: {docs}\n\nQuestion: {query}",
+        "random_seed": 42,
+    },
+    {
+        "system_prompt": "Answer from the documents.",
+        "user_prompt": "Question: {query}\n\nDocuments:\n{docs}",
+        "random_seed": 7,
+    },
+    # Conversions are not pre-split and go through str.format
+    {
+        "system_prompt": "You are a helpful assistant.",
+        "user_prompt": "{docs!s}\n\nQuestion: {query}",
+        "random_seed": 0,
+    },
+]
+
+
+@pytest.fixture(
+    scope="module", params=PROMPT_CONFIGS, ids=["docs-first", "query-first", "format"]
+)
+def preprocessor_case(request, tmp_path_factory):
+    """DataPreprocess built once per prompt config, with that config"""
+    config_data = request.param
+    base = tmp_path_factory.mktemp("pp")
+    config_path = base / "config.json"
+    config_path.write_bytes(json_dumps(config_data))
+
+    record = {
+        "id": "test",
+        "query": "test",
+        "golden_doc": ["test"],
+        "reference": ["test"],
+        "ground_truth": "test",
+    }
+    data_path = base / "data.jsonl"
+    data_path.write_bytes(json_dumps(record) + b"\n")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(DataPreprocess, "get_document_pool", lambda self: DOC_POOL)
+        preprocessor = DataPreprocess(
+            prompt_config_path=str(config_path), data_path=str(data_path)
+        )
+    return preprocessor, config_data
 
 
 # Configure pytest
@@ -2,23 +2,22 @@
 Test cases for src/data.py
 """
 
+import dataclasses
 import json
-import os
-import sys
-import tempfile
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 
-# Add src directory to Python path
-sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
-
-from data import DataPreprocess, EvalData
+import src.data as data_module
+from src.data import EvalData
 
 
 class TestEvalData:
     """Test EvalData class functionality"""
 
+    # State lives in fixtures, never on the test instance
+    __slots__ = ()
+
     def test_evaldata_creation(self):
         """Test creating EvalData instance"""
         data = EvalData(
@@ -29,11 +28,29 @@ class TestEvalData:
             ground_truth="Paris",
         )
 
-        assert data.id == "test_001"
-        assert data.query == "What is the capital of France?"
-        assert data.golden_doc == ["Paris is the capital of France."]
-        assert data.reference == ["Paris is the capital of France."]
-        assert data.ground_truth == "Paris"
+        expected = (
+            "test_001",
+            "What is the capital of France?",
+            ("Paris is the capital of France.",),
+            ("Paris is the capital of France.",),
+            "Paris",
+        )
+        assert (
+            data.id,
+            data.query,
+            data.golden_doc,
+            data.reference,
+            data.ground_truth,
+        ) == expected
+
+        # Slotted and frozen: no per-instance __dict__, fields are read-only
+        assert hasattr(EvalData, "__slots__")
+        assert not hasattr(data, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            data.ground_truth = "Lyon"
+
+        # Document lists are stored as tuples, so equal records hash equal
+        assert hash(data) == hash(EvalData.from_dict(dataclasses.asdict(data)))
 
     def test_evaldata_call_method(self):
         """Test EvalData __call__ method"""
@@ -45,11 +62,20 @@ class TestEvalData:
             ground_truth="4",
         )
 
-        assert data("id") == "test_002"
-        assert data("query") == "What is 2+2?"
-        assert data("golden_doc") == ["Basic arithmetic"]
-        assert data("reference") == ["Basic arithmetic"]
-        assert data("ground_truth") == "4"
+        expected = (
+            "test_002",
+            "What is 2+2?",
+            ("Basic arithmetic",),
+            ("Basic arithmetic",),
+            "4",
+        )
+        assert (
+            data("id"),
+            data("query"),
+            data("golden_doc"),
+            data("reference"),
+            data("ground_truth"),
+        ) == expected
 
     def test_evaldata_from_dict(self):
         """Test creating EvalData from dictionary"""
@@ -62,9 +88,20 @@ class TestEvalData:
         }
 
         data = EvalData.from_dict(data_dict)
-        assert data.id == "test_003"
-        assert data.query == "What is the color of the sky?"
-        assert data.ground_truth == "Blue"
+        expected = (
+            "test_003",
+            "What is the color of the sky?",
+            ("The sky is blue.",),
+            ("The sky is blue.",),
+            "Blue",
+        )
+        assert (
+            data.id,
+            data.query,
+            data.golden_doc,
+            data.reference,
+            data.ground_truth,
+        ) == expected
 
     def test_evaldata_get_answer(self):
         """Test get_answer method"""
@@ -78,7 +115,7 @@ class TestEvalData:
 
         assert data.get_answer() == "Jupiter"
 
-    def test_evaldata_jsonl_io(self):
+    def test_evaldata_jsonl_io(self, tmp_path):
         """Test JSONL save and load functionality"""
         test_data = [
             EvalData(
@@ -98,111 +135,93 @@ class TestEvalData:
         ]
 
         # Test saving to JSONL
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            temp_path = f.name
+        temp_path = tmp_path / "data.jsonl"
+        EvalData.to_jsonl(test_data, str(temp_path))
+        assert temp_path.exists()
 
-        try:
-            EvalData.to_jsonl(test_data, temp_path)
-            assert os.path.exists(temp_path)
+        # Records are written as UTF-8 JSON, one per line
+        lines = temp_path.read_bytes().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == ["test_005", "test_006"]
 
-            # Test loading from JSONL
-            loaded_data = EvalData.from_jsonl(temp_path)
-            assert len(loaded_data) == 2
-            assert loaded_data[0].id == "test_005"
-            assert loaded_data[1].id == "test_006"
-            assert loaded_data[0].ground_truth == "Tokyo"
-            assert loaded_data[1].ground_truth == "Berlin"
-
-        finally:
-            # Clean up
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+        # Test loading from JSONL
+        loaded_data = EvalData.from_jsonl(str(temp_path))
+        assert len(loaded_data) == 2
+        assert loaded_data[0].id == "test_005"
+        assert loaded_data[1].id == "test_006"
+        assert loaded_data[0].ground_truth == "Tokyo"
+        assert loaded_data[1].ground_truth == "Berlin"
 
 
 class TestDataPreprocess:
     """Test DataPreprocess class functionality"""
 
-    def test_datapreprocess_initialization(self):
-        """Test DataPreprocess initialization"""
-        # Create a temporary config file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            config_data = {
-                "system_prompt": "You are a helpful assistant.",
-                "user_prompt": "Based on the following documents: {docs}\n\nQuestion: {query}",
-                "random_seed": 42,
-            }
-            json.dump(config_data, f)
-            config_path = f.name
-
-        # Create a temporary data file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            data_content = '{"id": "test", "query": "test", "golden_doc": ["test"], "reference": ["test"], "ground_truth": "test"}'
-            f.write(data_content)
-            data_path = f.name
-
-        try:
-            # Test initialization with custom config and data
-            preprocessor = DataPreprocess(
-                prompt_config_path=config_path, data_path=data_path
-            )
+    # State lives in fixtures, never on the test instance
+    __slots__ = ()
 
-            assert preprocessor.name == "general"
-            assert (
-                preprocessor.prompt_config["system_prompt"]
-                == "You are a helpful assistant."
-            )
-            assert (
-                preprocessor.prompt_config["user_prompt"]
-                == "Based on the following documents: {docs}\n\nQuestion: {query}"
-            )
-            assert preprocessor.prompt_config["random_seed"] == 42
+    def test_datapreprocess_initialization(self, preprocessor_case):
+        """Test DataPreprocess initialization"""
+        preprocessor, config_data = preprocessor_case
 
-        finally:
-            # Clean up
-            if os.path.exists(config_path):
-                os.unlink(config_path)
-            if os.path.exists(data_path):
-                os.unlink(data_path)
+        assert preprocessor.name == "general"
+        assert preprocessor.prompt_config == config_data
 
-    def test_datapreprocess_generate_prompt(self):
+    def test_datapreprocess_generate_prompt(self, preprocessor_case):
         """Test prompt generation"""
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False) as f:
-            config_data = {
-                "system_prompt": "You are a helpful assistant.",
-                "user_prompt": "Based on the following documents: {docs}\n\nQuestion: {query}",
-                "random_seed": 42,
-            }
-            json.dump(config_data, f)
-            config_path = f.name
-
-        # Create a temporary data file
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".jsonl", delete=False) as f:
-            data_content = '{"id": "test", "query": "test", "golden_doc": ["test"], "reference": ["test"], "ground_truth": "test"}'
-            f.write(data_content)
-            data_path = f.name
-
-        try:
-            preprocessor = DataPreprocess(
-                prompt_config_path=config_path, data_path=data_path
-            )
+        preprocessor, config_data = preprocessor_case
+        query = "What is the capital of France?"
+        docs = ["Paris is the capital of France.", "France is a country in Europe."]
+
+        prompt = preprocessor.generate_prompt(query, docs)
+
+        assert len(prompt) == 2
+        assert prompt[0]["role"] == "system"
+        assert prompt[0]["content"] == config_data["system_prompt"]
+        assert prompt[1]["role"] == "user"
+        assert "Paris is the capital of France" in prompt[1]["content"]
+        assert "What is the capital of France?" in prompt[1]["content"]
+
+    def test_datapreprocess_generate_prompts_batch(self, preprocessor_case):
+        """Test batch prompt generation matches per-query prompts"""
+        preprocessor, _ = preprocessor_case
+        queries = ["What is the capital of France?", "Where is France?"]
+        docs_batch = [
+            ["Paris is the capital of France.", "France is a country in Europe."],
+            ["France is a country in Europe."],
+        ]
+
+        prompts = preprocessor.generate_prompts_batch(queries, docs_batch)
+
+        assert prompts == [
+            preprocessor.generate_prompt(query, docs)
+            for query, docs in zip(queries, docs_batch)
+        ]
+        assert "Where is France?" in prompts[1][1]["content"]
+        assert "Paris" not in prompts[1][1]["content"]
+
+
+def test_doc_pool_loaded_once_across_threads(tmp_path, monkeypatch):
+    """Concurrent dataset preparation shares a single parsed document pool"""
+    pool_path = tmp_path / "documents_pool.json"
+    pool_path.write_text(json.dumps({"d1": "Paris is the capital of France."}))
+    monkeypatch.setattr(data_module, "_DOC_POOLS", {})
+    parses = []
+    json_loads = data_module._json_loads
 
-            query = "What is the capital of France?"
-            docs = ["Paris is the capital of France.", "France is a country in Europe."]
+    def counting_loads(raw):
+        parses.append(raw)
+        return json_loads(raw)
 
-            prompt = preprocessor.generate_prompt(query, docs)
+    monkeypatch.setattr(data_module, "_json_loads", counting_loads)
 
-            assert len(prompt) == 2
-            assert prompt[0]["role"] == "system"
-            assert prompt[0]["content"] == "You are a helpful assistant."
-            assert prompt[1]["role"] == "user"
-            assert "Paris is the capital of France" in prompt[1]["content"]
-            assert "What is the capital of France?" in prompt[1]["content"]
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        pools = list(
+            executor.map(
+                lambda _: data_module._load_doc_pool(str(pool_path)), range(6)
+            )
+        )
 
-        finally:
-            if os.path.exists(config_path):
-                os.unlink(config_path)
-            if os.path.exists(data_path):
-                os.unlink(data_path)
+    assert len(parses) == 1
+    assert all(pool is pools[0] for pool in pools)
 
 
 if __name__ == "__main__":
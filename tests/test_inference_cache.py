@@ -0,0 +1,91 @@
+"""
+Test cases for src/inference_cache.py and its use in src/eval_main.py
+"""
+
+import pytest
+
+from src.eval_main import cache_model_key, cached_batch_generate
+from src.inference_cache import InferenceCache
+
+
+class EchoModel:
+    """Backend stub returning a prediction derived from each prompt"""
+
+    def __init__(self):
+        self.calls = []
+
+    def batch_generate(self, data, temperature=0.0, batch_size=16, **kwargs):
+        self.calls.append(list(data))
+        return [f"pred:{prompt}" for prompt in data]
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """InferenceCache in a fresh directory"""
+    cache = InferenceCache(cache_dir=str(tmp_path))
+    yield cache
+    cache.close()
+
+
+MODEL_KEY = ["model", "/path/to/model"]
+
+
+class TestInferenceCache:
+    """Test InferenceCache and cached_batch_generate"""
+
+    __slots__ = ()
+
+    def test_hit_miss_keeps_order(self, cache):
+        """Test cached and generated predictions come back in prompt order"""
+        cached = ["b", "d"]
+        cache.set_many(
+            {InferenceCache.make_key(MODEL_KEY, 0.0, p): f"cached:{p}" for p in cached}
+        )
+        model = EchoModel()
+        prompts = ["a", "b", "c", "d", "e"]
+
+        predictions = cached_batch_generate(model, cache, MODEL_KEY, prompts, 0.0, 16)
+
+        assert predictions == ["pred:a", "cached:b", "pred:c", "cached:d", "pred:e"]
+        assert model.calls == [["a", "c", "e"]]
+
+        # Every prompt is now cached, so the backend is not called again
+        predictions = cached_batch_generate(model, cache, MODEL_KEY, prompts, 0.0, 16)
+        assert predictions == ["pred:a", "cached:b", "pred:c", "cached:d", "pred:e"]
+        assert len(model.calls) == 1
+
+    def test_set_many_skips_errors(self, cache):
+        """Test failed generations are not stored, so they are retried"""
+        ok_key = InferenceCache.make_key(MODEL_KEY, 0.0, "ok")
+        err_key = InferenceCache.make_key(MODEL_KEY, 0.0, "err")
+        none_key = InferenceCache.make_key(MODEL_KEY, 0.0, "none")
+        cache.set_many({ok_key: "answer", err_key: "Error: timeout", none_key: None})
+
+        assert cache.get_many([ok_key, err_key, none_key]) == {ok_key: "answer"}
+
+    def test_key_depends_on_temperature(self):
+        """Test the key changes with the sampling temperature"""
+        assert InferenceCache.make_key(
+            MODEL_KEY, 0.0, "prompt"
+        ) != InferenceCache.make_key(MODEL_KEY, 0.7, "prompt")
+
+    def test_key_depends_on_max_tokens(self):
+        """Test the key changes with the max_tokens budget"""
+        keys = {
+            InferenceCache.make_key(
+                cache_model_key("model", "/path/to/model", gen_kwargs), 0.0, "prompt"
+            )
+            for gen_kwargs in ({}, {"max_tokens": 256}, {"max_tokens": 800})
+        }
+        assert len(keys) == 3
+
+    def test_get_many_over_chunk_size(self, cache):
+        """Test lookups spanning several SQLite parameter chunks"""
+        items = {
+            InferenceCache.make_key(MODEL_KEY, 0.0, f"prompt {i}"): f"answer {i}"
+            for i in range(1200)
+        }
+        cache.set_many(items)
+        missing = [InferenceCache.make_key(MODEL_KEY, 0.0, "absent")]
+
+        assert cache.get_many(list(items) + missing) == items
@@ -0,0 +1,75 @@
+"""
+Test cases for src/report/metrics.py
+"""
+
+import pytest
+
+from src.data import EvalResult
+from src.report.metrics import calculate_f1
+
+
+def _result(answer, prediction):
+    return EvalResult(
+        id="test", query="q", prompt="p", answer=answer, prediction=prediction
+    )
+
+
+# (answer, prediction, F1); list answers score the text after "</think>"
+# when there is one, otherwise the whole prediction
+F1_CASES = [
+    (["Paris", "Lyon"], "The capital is Paris", 0.4),
+    (["Paris", "Lyon"], "<think>Paris or Lyon</think>Paris", 1.0),
+    (["Paris", "Lyon"], "<think>Paris</think>The capital is Paris", 0.4),
+    (["Paris"], "Marseille", 0.0),
+    (["Paris"], None, 0.0),
+    ("Paris", "The capital is Paris", 0.4),
+    ("Paris", None, 0.0),
+]
+F1_IDS = [
+    "list-no-think",
+    "list-think-exact",
+    "list-think-partial",
+    "list-miss",
+    "list-none",
+    "str-partial",
+    "str-none",
+]
+
+
+class TestCalculateF1:
+    """Test calculate_f1 and its numba counterpart"""
+
+    __slots__ = ()
+
+    @pytest.mark.parametrize("answer,prediction,expected", F1_CASES, ids=F1_IDS)
+    def test_f1_single(self, answer, prediction, expected):
+        """Test F1 for a single result"""
+        assert calculate_f1([_result(answer, prediction)]) == pytest.approx(expected)
+
+    def test_f1_averages_results(self):
+        """Test F1 is averaged over all results"""
+        results = [_result(answer, prediction) for answer, prediction, _ in F1_CASES]
+        expected = sum(score for _, _, score in F1_CASES) / len(F1_CASES)
+        assert calculate_f1(results) == pytest.approx(expected)
+
+    def test_f1_empty(self):
+        """Test F1 of no results is 0"""
+        assert calculate_f1([]) == 0.0
+
+    @pytest.mark.parametrize("answer,prediction,expected", F1_CASES, ids=F1_IDS)
+    def test_f1_numba_matches_python(self, answer, prediction, expected):
+        """Test the numba scorer gives the same F1 as the Python path"""
+        pytest.importorskip("numpy")
+        from src.report.numba_metrics import calculate_f1_numba
+
+        results = [_result(answer, prediction)]
+        assert calculate_f1_numba(results) == pytest.approx(calculate_f1(results))
+        assert calculate_f1_numba(results) == pytest.approx(expected)
+
+    def test_f1_numba_matches_python_batch(self):
+        """Test the numba scorer matches the Python path over a batch"""
+        pytest.importorskip("numpy")
+        from src.report.numba_metrics import calculate_f1_numba
+
+        results = [_result(answer, prediction) for answer, prediction, _ in F1_CASES]
+        assert calculate_f1_numba(results) == pytest.approx(calculate_f1(results))
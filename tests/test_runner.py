@@ -0,0 +1,49 @@
+"""
+Test cases for src/report/runner.py
+"""
+
+import json
+
+import pytest
+
+from src.data import EvalResult
+from src.report.runner import Runner
+
+
+def _results():
+    """Two hotpotqa results with integer ids, one of them wrong"""
+    return [
+        EvalResult(id=0, query="q0", prompt="p", answer="Paris", prediction="Paris"),
+        EvalResult(id=1, query="q1", prompt="p", answer="Paris", prediction="Lyon"),
+    ]
+
+
+class TestRunner:
+    """Test Runner functionality"""
+
+    __slots__ = ()
+
+    def test_save_json_results_int_ids(self, tmp_path):
+        """Test results keyed by integer ids are saved with string keys"""
+        runner = Runner(output_dir=str(tmp_path))
+        runner.run_all({"hotpotqa": _results()}, max_workers=1)
+
+        with open(runner.save_json_results(), encoding="utf-8") as f:
+            saved = json.load(f)
+
+        assert saved["hotpotqa"]["error_id"] == [1]
+        assert saved["hotpotqa"]["error_details"] == {
+            "1": {"query": "q1", "ground_truth": "Paris", "prediction": "Lyon"}
+        }
+
+    @pytest.mark.parametrize("max_workers", [None, 1, 2], ids=["default", "1", "2"])
+    def test_run_all_labels_results(self, tmp_path, max_workers):
+        """Test the caller's results are labelled however datasets are run"""
+        results_data = {"hotpotqa": _results(), "musiqueqa": _results()}
+        runner = Runner(output_dir=str(tmp_path))
+        summary = runner.run_all(results_data, max_workers=max_workers)
+
+        assert list(summary) == ["hotpotqa", "musiqueqa"]
+        for name, results in results_data.items():
+            assert [result.label for result in results] == [True, False]
+            assert summary[name]["error_id"] == [1]